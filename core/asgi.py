@@ -8,6 +8,8 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 
 import os
 
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
 from django.core.asgi import get_asgi_application
 
 from channels.routing import ProtocolTypeRouter, URLRouter
@@ -21,8 +23,6 @@ import chat.routing
 from fastapi_app.main_app import app as fastapi_app
 
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
-
 django_asgi_app = get_asgi_application()
 
 
@@ -67,7 +67,6 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'courses.middleware.ReminderMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -120,6 +119,27 @@ DATABASES = {
 }
 
 
+# ---------------------------------------------------------------------
+# Cache (shared by all worker processes)
+# ---------------------------------------------------------------------
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", str(BASE_DIR / "django_cache")),
+    }
+}
+
+
+# Lecture media streaming: "" serves files from Django, "nginx" hands off
+# through X-Accel-Redirect (internal location MEDIA_ACCEL_PREFIX mapped to
+# MEDIA_ROOT), "apache" through X-Sendfile.
+MEDIA_ACCEL = os.getenv("MEDIA_ACCEL", "")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+
 # ---------------------------------------------------------------------
 # Channels (Redis)
 # ---------------------------------------------------------------------
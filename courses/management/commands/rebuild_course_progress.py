@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from courses.services.progress import rebuild_course_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute CourseProgress summaries from LectureProgress"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--course",
+            type=int,
+            action="append",
+            dest="courses",
+            help="Only rebuild this course (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("\n🔧 Rebuilding course progress...")
+        count = rebuild_course_progress(options.get("courses"))
+        self.stdout.write(f"✅ {count} progress rows rebuilt.")
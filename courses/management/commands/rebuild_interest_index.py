@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from courses.services.interests import rebuild_interest_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the student interest index from searches and enrollments"
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write("\n🔧 Rebuilding interest index...")
+        count = rebuild_interest_index()
+        self.stdout.write(f"✅ {count} interest terms indexed.")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.models import Course
+from courses.services.certificates import MAX_WORKERS, render_cohort_certificates
+
+
+class Command(BaseCommand):
+    help = "Issue and render certificates for every student who completed a course"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--course", type=int, required=True, help="Course id")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=MAX_WORKERS,
+            help="Rendering processes (1 renders in this process)",
+        )
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(id=options["course"]).first()
+        if course is None:
+            raise CommandError(f"Course {options['course']} does not exist")
+
+        self.stdout.write(f"\n🎓 Rendering certificates for '{course.title}'...")
+        count = render_cohort_certificates(course, max_workers=max(1, options["workers"]))
+        self.stdout.write(f"✅ {count} certificates rendered.")
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from courses.services.reminders import send_due_reminders
+
+
+class Command(BaseCommand):
+    help = "Send live class and event reminders (runs as a long-lived scheduler)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="Seconds between ticks (default: 60)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run a single tick and exit (for cron)",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        self.stdout.write(f"\n⏰ Reminder scheduler started (every {interval}s)")
+
+        while True:
+            close_old_connections()
+            started = time.monotonic()
+
+            try:
+                items, sent = send_due_reminders()
+                if items:
+                    self.stdout.write(
+                        f"📣 {items} reminders, {sent} notifications "
+                        f"in {time.monotonic() - started:.2f}s"
+                    )
+            except Exception as e:
+                self.stderr.write(f"⚠️ Reminder tick failed: {e}")
+
+            if options["once"]:
+                return
+
+            time.sleep(max(0, interval - (time.monotonic() - started)))
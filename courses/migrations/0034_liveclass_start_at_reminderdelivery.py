@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:00
+
+import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_start_at(apps, schema_editor):
+    LiveClass = apps.get_model('courses', 'LiveClass')
+
+    for cls in LiveClass.objects.filter(start_at__isnull=True).only('id', 'date', 'time').iterator():
+        cls.start_at = timezone.make_aware(datetime.datetime.combine(cls.date, cls.time))
+        cls.save(update_fields=['start_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0033_interestterm'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='liveclass',
+            name='start_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='courseevent',
+            name='start_time',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.RunPython(fill_start_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ReminderDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to='courses.courseevent')),
+                ('live_class', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to='courses.liveclass')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(fields=('live_class', 'user'), name='unique_live_class_reminder'),
+                    models.UniqueConstraint(fields=('event', 'user'), name='unique_event_reminder'),
+                ],
+            },
+        ),
+    ]
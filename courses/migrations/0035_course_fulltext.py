@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:30
+
+from django.db import migrations
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE `courses_course` '
+        'ADD FULLTEXT INDEX `course_search_ft` (`title`, `description`)'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('ALTER TABLE `courses_course` DROP INDEX `course_search_ft`')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0034_liveclass_start_at_reminderdelivery'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0035_course_fulltext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='pdf',
+            field=models.FileField(blank=True, null=True, upload_to='certificates/'),
+        ),
+    ]
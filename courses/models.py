@@ -2,6 +2,7 @@ import uuid
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_time
 import datetime
 
 from users.models import User
@@ -154,13 +155,62 @@ class LectureProgress(models.Model):
         return f"{self.student.username} - {self.lecture.title} ({'Done' if self.completed else 'Pending'})"
 
 
+class CourseProgress(models.Model):
+    """
+    Per-student completion summary of a course, kept in step with
+    LectureProgress and Lecture changes (see courses.services.progress).
+    """
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="course_progress")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="student_progress")
+    completed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    percent = models.FloatField(default=0.0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('student', 'course')
+        indexes = [
+            models.Index(fields=["course", "student"]),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.course.title} ({self.percent}%)"
+
+
+class InterestTerm(models.Model):
+    """
+    Inverted index of student interests: a recent search keyword or an
+    enrolled category -> user. Maintained by courses.services.interests.
+    """
+    KEYWORD = "keyword"
+    CATEGORY = "category"
+    KIND_CHOICES = [
+        (KEYWORD, "Search keyword"),
+        (CATEGORY, "Enrolled category"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    term = models.CharField(max_length=255)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="interest_terms")
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('kind', 'term', 'user')
+        indexes = [
+            models.Index(fields=["user", "kind", "updated_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.kind}: {self.term}"
+
+
 class CourseEvent(models.Model):
     course = models.ForeignKey(
         Course, on_delete=models.CASCADE, related_name="events"
     )
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
-    start_time = models.DateTimeField()
+    start_time = models.DateTimeField(db_index=True)
     end_time = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
     reminder_sent = models.BooleanField(default=False)
@@ -179,6 +229,8 @@ class LiveClass(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     reminder_sent = models.BooleanField(default=False)
     live_class_order = models.PositiveIntegerField(default=0)
+    # date + time as one aware datetime, kept in sync by save()
+    start_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     @property
     def start_datetime(self):
@@ -187,6 +239,22 @@ class LiveClass(models.Model):
     class Meta:
         ordering = ["live_class_order", "id"]
 
+    def save(self, *args, **kwargs):
+        # views may assign the raw POST strings to date/time
+        if isinstance(self.date, str):
+            self.date = parse_date(self.date)
+        if isinstance(self.time, str):
+            self.time = parse_time(self.time)
+
+        if self.date and self.time:
+            self.start_at = self.start_datetime
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"date", "time"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"start_at"}
+
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.topic} ({self.course.title}) on {self.date} at {self.time}"
 
@@ -228,6 +296,8 @@ class Certificate(models.Model):
     certificate_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     issued_on = models.DateField(auto_now_add=True)
     downloaded_at = models.DateTimeField(null=True, blank=True)
+    # rendered once when issued, see courses.services.certificates
+    pdf = models.FileField(upload_to="certificates/", null=True, blank=True)
 
     def __str__(self):
         return f"{self.student.username} - {self.course.title}"
@@ -289,6 +359,25 @@ class Notification(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.message[:30]}"
 
+
+class ReminderDelivery(models.Model):
+    """
+    One row per (user, live class) or (user, event) reminder already sent.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reminder_deliveries")
+    live_class = models.ForeignKey("LiveClass", on_delete=models.CASCADE, null=True, blank=True, related_name="reminder_deliveries")
+    event = models.ForeignKey("CourseEvent", on_delete=models.CASCADE, null=True, blank=True, related_name="reminder_deliveries")
+    sent_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["live_class", "user"], name="unique_live_class_reminder"),
+            models.UniqueConstraint(fields=["event", "user"], name="unique_event_reminder"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.live_class or self.event}"
+
 class AssignmentQuestion(models.Model):
     assignment = models.ForeignKey(
         Assignment,
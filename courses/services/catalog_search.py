@@ -0,0 +1,75 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from courses.models import Course
+
+# created by migration 0035_course_fulltext (MySQL only)
+FULLTEXT_INDEX = "course_search_ft"
+
+# InnoDB's innodb_ft_min_token_size default; shorter words are not indexed
+MIN_TOKEN_LENGTH = 3
+
+
+def tokenize(text):
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def _fulltext_available():
+    return connection.vendor == "mysql"
+
+
+def _match_sql():
+    qn = connection.ops.quote_name
+    table = qn(Course._meta.db_table)
+    return (
+        f"MATCH ({table}.{qn('title')}, {table}.{qn('description')}) "
+        f"AGAINST (%s IN BOOLEAN MODE)"
+    )
+
+
+def _boolean_query(tokens):
+    # any word may match, each as a prefix ("pyth" finds "python")
+    return " ".join(f"{t}*" for t in tokens)
+
+
+def _icontains_q(tokens):
+    q = Q()
+    for t in tokens:
+        q |= Q(title__icontains=t) | Q(description__icontains=t)
+    return q
+
+
+def search_courses(queryset, query):
+    """
+    Courses of `queryset` matching any word of `query`, best matches first.
+    Uses the FULLTEXT index on MySQL; other databases fall back to icontains.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+
+    indexed = [t for t in tokens if len(t) >= MIN_TOKEN_LENGTH]
+
+    if not _fulltext_available() or not indexed:
+        return queryset.filter(_icontains_q(tokens)).distinct()
+
+    return (
+        queryset
+        .annotate(search_rank=RawSQL(_match_sql(), [_boolean_query(indexed)]))
+        .filter(search_rank__gt=0)
+        .order_by("-search_rank", "-created_at")
+    )
+
+
+def matching_course_ids(keywords):
+    """
+    Ids of courses matching any of several keywords, as a subquery.
+    """
+    tokens = sorted({t for kw in keywords for t in tokenize(kw)})
+    if not tokens:
+        return Course.objects.none().values("id")
+
+    return search_courses(Course.objects.all(), " ".join(tokens)).order_by().values("id")
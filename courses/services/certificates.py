@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.urls import reverse
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from courses.models import Certificate, CourseProgress
+from courses.services.progress import get_course_progress
+
+MAX_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def full_name(user):
+    return f"{user.first_name} {user.last_name}".strip() or user.username
+
+
+def render_certificate_pdf(name, course_title, issued_on, certificate_id, verify_url=None):
+    """
+    The certificate PDF as bytes. Takes plain values only so it can run
+    in a worker process.
+    """
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    p.setFont("Helvetica-Bold", 28)
+    p.drawCentredString(width/2, height - 150, "Certificate of Completion")
+
+    p.setFont("Helvetica", 16)
+    p.drawCentredString(width/2, height - 200, "This is to certify that")
+
+    p.setFont("Helvetica-Bold", 20)
+    p.drawCentredString(width/2, height - 250, name)
+
+    p.setFont("Helvetica", 16)
+    p.drawCentredString(width/2, height - 300, "has successfully completed the course")
+
+    p.setFont("Helvetica-Bold", 20)
+    p.drawCentredString(width/2, height - 340, course_title)
+
+    p.setFont("Helvetica", 12)
+    p.drawCentredString(width/2, height - 400, f"Issued on: {issued_on}")
+    p.drawCentredString(width/2, height - 420, f"Certificate ID: {certificate_id}")
+
+    if verify_url:
+        p.setFont("Helvetica", 10)
+        p.drawCentredString(width/2, height - 440, f"Verify at: {verify_url}")
+
+    p.line(150, height - 500, width - 150, height - 500)
+    p.setFont("Helvetica-Oblique", 12)
+    p.drawCentredString(width/2, height - 520, "Speshway Learning Platform")
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def _render_args(certificate):
+    verify_path = reverse("courses:verify_certificate", args=[certificate.certificate_id])
+    return (
+        full_name(certificate.student),
+        certificate.course.title,
+        certificate.issued_on.strftime('%B %d, %Y'),
+        str(certificate.certificate_id),
+        f"{settings.SITE_URL}{verify_path}",
+    )
+
+
+def _render_star(args):
+    return render_certificate_pdf(*args)
+
+
+def _store_pdf(certificate, pdf_bytes):
+    certificate.pdf.save(
+        f"{certificate.certificate_id}.pdf",
+        ContentFile(pdf_bytes),
+        save=False
+    )
+
+
+def is_course_completed(student, course):
+    progress = get_course_progress(student, course)
+    return progress.total > 0 and progress.completed >= progress.total
+
+
+def issue_certificate(student, course):
+    """
+    Create the certificate (if needed) and render its PDF once.
+    """
+    certificate, _ = Certificate.objects.select_related("student", "course").get_or_create(
+        student=student, course=course
+    )
+
+    if not certificate.pdf:
+        _store_pdf(certificate, render_certificate_pdf(*_render_args(certificate)))
+        certificate.save(update_fields=["pdf"])
+
+    return certificate
+
+
+def render_cohort_certificates(course, max_workers=MAX_WORKERS):
+    """
+    Issue certificates for every student who completed `course` and render
+    all missing PDFs across a process pool. Returns the number rendered.
+    """
+    completed_ids = list(
+        CourseProgress.objects.filter(course=course, total__gt=0)
+        .filter(completed__gte=F("total"))
+        .values_list("student_id", flat=True)
+    )
+
+    existing = set(
+        Certificate.objects.filter(course=course, student_id__in=completed_ids)
+        .values_list("student_id", flat=True)
+    )
+    Certificate.objects.bulk_create(
+        [Certificate(student_id=sid, course=course) for sid in completed_ids if sid not in existing],
+        ignore_conflicts=True
+    )
+
+    pending = list(
+        # certificates issued before the pdf column existed hold NULL
+        Certificate.objects.filter(course=course)
+        .filter(Q(pdf="") | Q(pdf__isnull=True))
+        .select_related("student", "course")
+    )
+    if not pending:
+        return 0
+
+    args = [_render_args(c) for c in pending]
+
+    if max_workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pdfs = list(pool.map(_render_star, args, chunksize=8))
+    else:
+        pdfs = [_render_star(a) for a in args]
+
+    for certificate, pdf_bytes in zip(pending, pdfs):
+        _store_pdf(certificate, pdf_bytes)
+
+    with transaction.atomic():
+        Certificate.objects.bulk_update(pending, ["pdf"], batch_size=500)
+
+    return len(pending)
@@ -0,0 +1,244 @@
+import atexit
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from courses.models import Lecture, LectureProgress
+
+FLUSH_INTERVAL_SECONDS = 10
+FLUSH_BATCH_SIZE = 500
+FLUSH_LOCK_SECONDS = 60
+POSITION_TTL = 24 * 60 * 60
+
+# Pending positions live in the shared cache, so every worker sees them and
+# a restarting worker loses none:
+#   lecture_heartbeat:{student}:{lecture}   (position, duration, seen_at)
+#   lecture_dirty:{student}:{lecture}       set while that entry is unflushed
+#   lecture_dirty_slot:{n}                  (student, lecture), n from _SEQ_KEY
+# A flush, in whichever worker, writes slots (_CURSOR_KEY, _SEQ_KEY].
+_SEQ_KEY = "lecture_dirty_seq"
+_CURSOR_KEY = "lecture_dirty_cursor"
+_FLUSH_LOCK_KEY = "lecture_dirty_flush"
+
+_lock = threading.Lock()
+_flusher = None
+
+
+def _position_key(student_id, lecture_id):
+    return f"lecture_heartbeat:{student_id}:{lecture_id}"
+
+
+def _dirty_key(student_id, lecture_id):
+    return f"lecture_dirty:{student_id}:{lecture_id}"
+
+
+def _slot_key(slot):
+    return f"lecture_dirty_slot:{slot}"
+
+
+def lecture_course_id(lecture_id):
+    """
+    Course of a lecture, cached; None if the lecture does not exist.
+    """
+    key = f"lecture_course:{lecture_id}"
+    course_id = cache.get(key)
+    if course_id is None:
+        course_id = (
+            Lecture.objects.filter(id=lecture_id)
+            .values_list("module__course_id", flat=True)
+            .first()
+        )
+        if course_id is not None:
+            cache.set(key, course_id, None)
+    return course_id
+
+
+def forget_lecture_course(lecture_id):
+    cache.delete(f"lecture_course:{lecture_id}")
+
+
+def record_heartbeat(student_id, lecture_id, position, duration):
+    """
+    Remember the player position in the shared cache, where every worker
+    reads it at once. LectureProgress is written by the next flush, one row
+    per (student, lecture) however many heartbeats arrived meanwhile.
+    """
+    position = max(0.0, float(position))
+    duration = max(0.0, float(duration))
+    entry = (position, duration, timezone.now())
+
+    cache.set(_position_key(student_id, lecture_id), entry, POSITION_TTL)
+
+    full = False
+    if cache.add(_dirty_key(student_id, lecture_id), 1, POSITION_TTL):
+        cache.add(_SEQ_KEY, 0, None)
+        slot = cache.incr(_SEQ_KEY)
+        cache.set(_slot_key(slot), (student_id, lecture_id), POSITION_TTL)
+        full = slot - (cache.get(_CURSOR_KEY) or 0) >= FLUSH_BATCH_SIZE
+
+    _ensure_flusher()
+    if full:
+        flush_heartbeats()
+
+
+def last_positions(student_id, lecture_ids):
+    """
+    {lecture_id: seconds} to resume the student's lectures from. Pending
+    positions are read from the cache, the rest from LectureProgress, so a
+    reload between flushes does not jump back to an older position.
+    """
+    lecture_ids = list(lecture_ids)
+    positions = dict(
+        LectureProgress.objects.filter(
+            student_id=student_id,
+            lecture_id__in=lecture_ids,
+            last_position__gt=0
+        ).values_list("lecture_id", "last_position")
+    )
+
+    keys = {_position_key(student_id, lecture_id): lecture_id for lecture_id in lecture_ids}
+    for key, (position, _, _) in cache.get_many(list(keys)).items():
+        positions[keys[key]] = position
+
+    return positions
+
+
+def discard_heartbeat(student_id, lecture_id):
+    """
+    Drop a pending position, e.g. once the lecture was completed.
+    """
+    cache.delete_many([
+        _position_key(student_id, lecture_id),
+        _dirty_key(student_id, lecture_id),
+    ])
+
+
+def _percent(position, duration):
+    return round(min(position / duration, 1.0) * 100, 2) if duration else 0.0
+
+
+def flush_heartbeats():
+    """
+    Write every pending position, FLUSH_BATCH_SIZE slots at a time, each
+    batch with one select, one bulk_update and one bulk_create. One worker
+    flushes at a time; slots are only passed once their batch committed.
+    Returns the number of rows written.
+    """
+    if not cache.add(_FLUSH_LOCK_KEY, 1, FLUSH_LOCK_SECONDS):
+        return 0
+
+    written = 0
+    try:
+        while True:
+            cursor = cache.get(_CURSOR_KEY) or 0
+            end = min(cache.get(_SEQ_KEY) or 0, cursor + FLUSH_BATCH_SIZE)
+            if end <= cursor:
+                break
+
+            slots = [_slot_key(slot) for slot in range(cursor + 1, end + 1)]
+            pairs = set(cache.get_many(slots).values())
+
+            # a heartbeat arriving from here on takes a new slot
+            cache.delete_many([_dirty_key(s, l) for s, l in pairs])
+
+            entries = cache.get_many([_position_key(s, l) for s, l in pairs])
+            batch = {
+                (s, l): entries[_position_key(s, l)]
+                for s, l in pairs
+                if _position_key(s, l) in entries
+            }
+
+            try:
+                written += _write_batch(batch)
+            except Exception as e:
+                print("⚠️ Heartbeat flush failed:", e)
+                break
+
+            cache.set(_CURSOR_KEY, end, None)
+            cache.delete_many(slots)
+    finally:
+        cache.delete(_FLUSH_LOCK_KEY)
+
+    return written
+
+
+def _write_batch(batch):
+    if not batch:
+        return 0
+
+    student_ids = {s for s, _ in batch}
+    lecture_ids = {l for _, l in batch}
+
+    with transaction.atomic():
+        # locked, so a completion committing meanwhile waits for this write
+        existing = {
+            (p.student_id, p.lecture_id): p
+            for p in LectureProgress.objects.select_for_update().filter(
+                student_id__in=student_ids,
+                lecture_id__in=lecture_ids
+            )
+            if (p.student_id, p.lecture_id) in batch
+        }
+
+        to_update = []
+        to_create = []
+
+        for (student_id, lecture_id), (position, duration, seen_at) in batch.items():
+            row = existing.get((student_id, lecture_id))
+            if row is None:
+                to_create.append(LectureProgress(
+                    student_id=student_id,
+                    lecture_id=lecture_id,
+                    last_position=position,
+                    duration=duration,
+                    progress=_percent(position, duration),
+                    updated_at=seen_at,
+                ))
+                continue
+
+            if row.completed:
+                continue
+
+            row.last_position = position
+            row.duration = duration or row.duration
+            row.progress = max(row.progress, _percent(position, row.duration))
+            row.updated_at = seen_at
+            to_update.append(row)
+
+        LectureProgress.objects.bulk_update(
+            to_update,
+            ["last_position", "duration", "progress", "updated_at"],
+            batch_size=FLUSH_BATCH_SIZE
+        )
+        # a completion may have created the row since the select; it wins
+        LectureProgress.objects.bulk_create(
+            to_create, batch_size=FLUSH_BATCH_SIZE, ignore_conflicts=True
+        )
+
+    return len(to_update) + len(to_create)
+
+
+def _run():
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        close_old_connections()
+        try:
+            flush_heartbeats()
+        finally:
+            connection.close()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None:
+        return
+    with _lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_run, name="heartbeat-flush", daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush_heartbeats)
@@ -0,0 +1,138 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from courses.models import Enrollment, InterestTerm
+from users.models import CourseSearch
+
+User = get_user_model()
+
+# only a student's most recent searches count as interests
+RECENT_SEARCHES = 10
+
+
+def record_search(user_id, keyword):
+    """
+    Index a search keyword for its user and drop keywords that fell
+    out of the user's RECENT_SEARCHES most recent ones.
+    """
+    term = (keyword or "").lower()
+    if not term:
+        return
+
+    InterestTerm.objects.update_or_create(
+        kind=InterestTerm.KEYWORD,
+        term=term[:255],
+        user_id=user_id,
+        defaults={"updated_at": timezone.now()}
+    )
+
+    stale = list(
+        InterestTerm.objects.filter(user_id=user_id, kind=InterestTerm.KEYWORD)
+        .order_by("-updated_at", "-id")
+        .values_list("id", flat=True)[RECENT_SEARCHES:]
+    )
+    if stale:
+        InterestTerm.objects.filter(id__in=stale).delete()
+
+
+def add_category(user_id, category):
+    InterestTerm.objects.get_or_create(
+        kind=InterestTerm.CATEGORY,
+        term=category,
+        user_id=user_id
+    )
+
+
+def refresh_categories(user_id):
+    """
+    Make the user's category terms match their current enrollments.
+    """
+    enrolled = set(
+        Enrollment.objects.filter(student_id=user_id)
+        .values_list("course__category", flat=True)
+    )
+    terms = InterestTerm.objects.filter(user_id=user_id, kind=InterestTerm.CATEGORY)
+    indexed = set(terms.values_list("term", flat=True))
+
+    if indexed - enrolled:
+        terms.filter(term__in=indexed - enrolled).delete()
+
+    InterestTerm.objects.bulk_create(
+        [
+            InterestTerm(kind=InterestTerm.CATEGORY, term=category, user_id=user_id)
+            for category in enrolled - indexed
+        ],
+        ignore_conflicts=True
+    )
+
+
+def interested_user_ids(course):
+    """
+    Students whose recent searches match the course (keyword contained in
+    the title or description, or equal to the category) or who are enrolled
+    in a course of the same category.
+
+    The keyword scan runs over distinct indexed keywords, not over students.
+    """
+    title = course.title.lower()
+    description = course.description.lower()
+    category = course.category.lower()
+
+    keywords = (
+        InterestTerm.objects.filter(kind=InterestTerm.KEYWORD)
+        .values_list("term", flat=True)
+        .distinct()
+    )
+    matched = [
+        kw for kw in keywords
+        if kw in title or kw in description or kw == category
+    ]
+
+    return (
+        InterestTerm.objects.filter(
+            Q(kind=InterestTerm.CATEGORY, term=course.category)
+            | Q(kind=InterestTerm.KEYWORD, term__in=matched),
+            user__role="student"
+        )
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+def rebuild_interest_index(batch_size=1000):
+    """
+    Recreate every term from CourseSearch and Enrollment.
+    Returns the number of terms written.
+    """
+    terms = []
+
+    recent = {}
+    searches = (
+        CourseSearch.objects.order_by("user_id", "-searched_at")
+        .values_list("user_id", "keyword", "searched_at")
+    )
+    for user_id, keyword, searched_at in searches.iterator():
+        kept = recent.setdefault(user_id, {})
+        term = (keyword or "").lower()[:255]
+        if term and term not in kept and len(kept) < RECENT_SEARCHES:
+            kept[term] = searched_at
+
+    for user_id, kept in recent.items():
+        for term, searched_at in kept.items():
+            terms.append(InterestTerm(
+                kind=InterestTerm.KEYWORD, term=term, user_id=user_id, updated_at=searched_at
+            ))
+
+    categories = (
+        Enrollment.objects.values_list("student_id", "course__category").distinct()
+    )
+    for user_id, category in categories.iterator():
+        terms.append(InterestTerm(kind=InterestTerm.CATEGORY, term=category, user_id=user_id))
+
+    with transaction.atomic():
+        InterestTerm.objects.all().delete()
+        InterestTerm.objects.bulk_create(terms, batch_size=batch_size, ignore_conflicts=True)
+
+    return len(terms)
@@ -0,0 +1,66 @@
+import time
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from courses.models import Course
+
+LANDING_TTL = 60 * 60
+POPULAR_COURSES = 4
+
+_VERSION_KEY = "landing_version"
+
+
+def landing_version():
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        cache.add(_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(_VERSION_KEY)
+    return version
+
+
+def invalidate_landing():
+    """
+    Called when a course or an enrollment changes; cached aggregates and
+    cached landing pages of the previous version are no longer read.
+    """
+    cache.set(_VERSION_KEY, time.time_ns(), None)
+
+
+def approved_courses():
+    return Course.objects.filter(status="approved", is_published=True)
+
+
+def _compute():
+    popular_categories = list(
+        approved_courses()
+        .values("category")
+        .annotate(total=Count("id"))
+        .order_by("-total")
+    )
+
+    popular_courses = list(
+        approved_courses()
+        .annotate(popularity=Count("enrollments"))
+        .order_by("-popularity", "-created_at")[:POPULAR_COURSES]
+    )
+
+    return {
+        "popular_categories": popular_categories,
+        "popular_courses": popular_courses,
+    }
+
+
+def get_landing_aggregates():
+    """
+    Popular categories and the most enrolled courses, computed once per
+    landing version.
+    """
+    key = f"landing_aggregates:{landing_version()}"
+
+    aggregates = cache.get(key)
+    if aggregates is None:
+        aggregates = _compute()
+        cache.set(key, aggregates, LANDING_TTL)
+
+    return aggregates
@@ -0,0 +1,178 @@
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+from courses.models import Enrollment
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# how long an access decision is remembered in the session
+ACCESS_TTL = 5 * 60
+_SESSION_KEY = "media_access"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def can_stream(request, course):
+    """
+    Admins, staff, the course instructor and enrolled students may stream
+    its media.
+    Positive answers are kept in the session for ACCESS_TTL seconds, so the
+    many range requests of one playback hit the database once.
+    """
+    user = request.user
+    if user.role == "admin" or user.is_staff or user.is_superuser:
+        return True
+    if course.instructor_id == user.id:
+        return True
+
+    return is_enrolled_cached(request, course.id)
+
+
+def is_enrolled_cached(request, course_id):
+    """
+    Enrollment check for the current user, remembered in the session.
+    """
+    granted = request.session.get(_SESSION_KEY, {})
+    key = str(course_id)
+    if granted.get(key, 0) > time.time():
+        return True
+
+    if not Enrollment.objects.filter(student=request.user, course_id=course_id).exists():
+        return False
+
+    granted = {k: v for k, v in granted.items() if v > time.time()}
+    granted[key] = time.time() + ACCESS_TTL
+    request.session[_SESSION_KEY] = granted
+    return True
+
+
+def file_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single "bytes=" range, or None when the
+    header is absent or not something we serve partially (multiple ranges,
+    other units, last byte before the first). Raises RangeNotSatisfiable
+    when it lies past the end.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if size == 0:
+        raise RangeNotSatisfiable
+
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        # syntactically invalid (RFC 7233 2.1): ignore the header
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    modified = parse_http_date_safe(value)
+    return modified is not None and int(mtime) <= modified
+
+
+def _read_range(path, start, length, chunk_size=STREAM_CHUNK_SIZE):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _accel_response(field_file, content_type):
+    """
+    Let the front proxy send the file (MEDIA_ACCEL = "nginx" or "apache").
+    The proxy handles Range itself.
+    """
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_ACCEL == "nginx":
+        response["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_PREFIX}{quote(field_file.name)}"
+    else:
+        response["X-Sendfile"] = field_file.path
+    return response
+
+
+def stream_file(request, field_file):
+    """
+    Serve a stored FileField with Range / If-Range / ETag support.
+    Full responses go through FileResponse (wsgi.file_wrapper, sendfile
+    where the server has it); partial ones are read in STREAM_CHUNK_SIZE chunks.
+    """
+    content_type = mimetypes.guess_type(field_file.name)[0] or "application/octet-stream"
+
+    if settings.MEDIA_ACCEL:
+        return _accel_response(field_file, content_type)
+
+    path = field_file.path
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = file_etag(stat)
+
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(path, start, length), status=206, content_type=content_type
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection, transaction
+from django.db.models import QuerySet
+
+from courses.models import Notification
+
+NOTIFY_BATCH_SIZE = 1000
+MESSAGE_MAX_LENGTH = Notification._meta.get_field("message").max_length
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify")
+_stats_lock = threading.Lock()
+_stats = {"fanouts": 0, "notifications": 0, "seconds": 0.0, "last": None}
+
+
+def _recipient_ids(recipients):
+    """
+    Accepts a User queryset, a flat values_list of user ids, or any iterable of ids.
+    """
+    if isinstance(recipients, QuerySet) and recipients._fields is None:
+        recipients = recipients.values_list("pk", flat=True)
+
+    if isinstance(recipients, QuerySet):
+        return recipients.iterator(chunk_size=NOTIFY_BATCH_SIZE)
+    return iter(recipients)
+
+
+def _fan_out(recipients, message, url, batch_size):
+    started = time.perf_counter()
+    sent = 0
+
+    try:
+        seen = set()
+        batch = []
+
+        for user_id in _recipient_ids(recipients):
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+
+            batch.append(Notification(user_id=user_id, message=message, url=url))
+            if len(batch) >= batch_size:
+                Notification.objects.bulk_create(batch)
+                sent += len(batch)
+                batch = []
+
+        if batch:
+            Notification.objects.bulk_create(batch)
+            sent += len(batch)
+
+    except Exception as e:
+        print("⚠️ Notification fan-out failed:", e)
+
+    elapsed = time.perf_counter() - started
+    rate = sent / elapsed if elapsed else float(sent)
+
+    with _stats_lock:
+        _stats["fanouts"] += 1
+        _stats["notifications"] += sent
+        _stats["seconds"] += elapsed
+        _stats["last"] = {"sent": sent, "seconds": round(elapsed, 3), "per_second": round(rate)}
+
+    print(f"📣 Notified {sent} users in {elapsed:.2f}s ({rate:.0f}/s)")
+    return sent
+
+
+def _fan_out_in_worker(*args):
+    close_old_connections()
+    try:
+        return _fan_out(*args)
+    finally:
+        # worker threads must not keep their connection open
+        connection.close()
+
+
+def notify_users(recipients, message, url=None, batch_size=NOTIFY_BATCH_SIZE, background=True, **context):
+    """
+    Send one notification to every recipient.
+
+    `message` is a str.format template filled from `context`. Rows are
+    inserted with bulk_create in `batch_size` batches once the current
+    transaction commits, on a background worker unless background=False.
+    """
+    if context:
+        message = message.format(**context)
+    message = message[:MESSAGE_MAX_LENGTH]
+
+    if not background:
+        return _fan_out(recipients, message, url, batch_size)
+
+    transaction.on_commit(
+        lambda: _executor.submit(_fan_out_in_worker, recipients, message, url, batch_size)
+    )
+
+
+def fanout_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+
+    stats["per_second"] = round(stats["notifications"] / stats["seconds"]) if stats["seconds"] else 0
+    stats["seconds"] = round(stats["seconds"], 3)
+    return stats
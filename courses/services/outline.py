@@ -0,0 +1,100 @@
+import time
+
+from django.core.cache import cache
+
+from courses.models import Assignment, LiveClass, Module
+from quizzes.models import Quiz
+
+OUTLINE_TTL = 60 * 60
+
+# structure_json item type -> (model, id field in the item)
+OUTLINE_TYPES = {
+    "Module": (Module, "module_id"),
+    "Quiz": (Quiz, "quiz_id"),
+    "Assignment": (Assignment, "assignment_id"),
+    "LiveClass": (LiveClass, "liveclass_id"),
+}
+
+
+def _version_key(course_id):
+    return f"course_outline_version:{course_id}"
+
+
+def outline_version(course_id):
+    version = cache.get(_version_key(course_id))
+    if version is None:
+        cache.add(_version_key(course_id), time.time_ns(), None)
+        version = cache.get(_version_key(course_id))
+    return version
+
+
+def invalidate_course_outline(course_id):
+    """
+    Move the course to a new outline version; entries cached under
+    the old version are never read again and expire on their own.
+    """
+    if course_id:
+        cache.set(_version_key(course_id), time.time_ns(), None)
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_outline(course):
+    structure = course.structure_json or []
+
+    ids = {item_type: set() for item_type in OUTLINE_TYPES}
+    for item in structure:
+        item_type = item.get("type")
+        if item_type in OUTLINE_TYPES:
+            object_id = _as_id(item.get(OUTLINE_TYPES[item_type][1]))
+            if object_id:
+                ids[item_type].add(object_id)
+
+    objects = {}
+    for item_type, (model, _) in OUTLINE_TYPES.items():
+        if not ids[item_type]:
+            objects[item_type] = {}
+            continue
+
+        queryset = model.objects.filter(course=course, id__in=ids[item_type])
+        if model is Module:
+            queryset = queryset.prefetch_related("lectures")
+
+        objects[item_type] = {obj.id: obj for obj in queryset}
+
+    outline = []
+    for item in structure:
+        item_type = item.get("type")
+        if item_type not in OUTLINE_TYPES:
+            continue
+
+        obj = objects[item_type].get(_as_id(item.get(OUTLINE_TYPES[item_type][1])))
+        if obj is None:
+            continue
+
+        outline.append({"type": item_type, "item": item, "obj": obj})
+
+    return outline
+
+
+def resolve_course_outline(course):
+    """
+    The course's structure_json items that still exist, in order, as
+    {"type", "item", "obj"}. Modules come with their lectures prefetched.
+
+    Every referenced object is loaded with one query per type and the
+    result is cached per course outline version (see courses.signals).
+    """
+    key = f"course_outline:{course.id}:{outline_version(course.id)}"
+
+    outline = cache.get(key)
+    if outline is None:
+        outline = _load_outline(course)
+        cache.set(key, outline, OUTLINE_TTL)
+
+    return outline
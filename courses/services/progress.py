@@ -0,0 +1,182 @@
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from courses.models import CourseProgress, Enrollment, Lecture, LectureProgress
+
+
+def _percent(completed, total):
+    return round(completed / total * 100, 2) if total else 0
+
+
+def refresh_course_progress(student_id, course_id):
+    """
+    Recompute one student's summary from LectureProgress (two counts).
+    Used for new enrollments, bulk deletes and the rebuild command.
+    """
+    total = Lecture.objects.filter(module__course_id=course_id).count()
+    completed = LectureProgress.objects.filter(
+        student_id=student_id,
+        lecture__module__course_id=course_id,
+        completed=True
+    ).count()
+
+    progress, _ = CourseProgress.objects.update_or_create(
+        student_id=student_id,
+        course_id=course_id,
+        defaults={
+            "completed": completed,
+            "total": total,
+            "percent": _percent(completed, total),
+        }
+    )
+    return progress
+
+
+def apply_completion_delta(student_id, course_id, delta):
+    """
+    A lecture was completed (+1) or un-completed (-1).
+    """
+    with transaction.atomic():
+        progress = (
+            CourseProgress.objects.select_for_update()
+            .filter(student_id=student_id, course_id=course_id)
+            .first()
+        )
+        if progress is None:
+            if delta < 0:
+                # nothing to undo; the summary is built on first read
+                return None
+            # first activity in this course: the lecture write is already visible
+            progress = refresh_course_progress(student_id, course_id)
+        else:
+            progress.completed = max(0, progress.completed + delta)
+            progress.percent = _percent(progress.completed, progress.total)
+
+        progress.last_activity = timezone.now()
+        progress.save(update_fields=["completed", "percent", "last_activity"])
+
+    return progress
+
+
+def apply_lecture_count_delta(course_id, delta):
+    """
+    A lecture was added (+1) or removed (-1): every student's total moves.
+    """
+    rows = CourseProgress.objects.filter(course_id=course_id)
+
+    if delta > 0:
+        rows.update(total=F("total") + delta)
+    else:
+        rows.filter(total__gte=-delta).update(total=F("total") + delta)
+        rows.filter(total__lt=-delta).update(total=0)
+
+    rows.filter(completed__gt=F("total")).update(completed=F("total"))
+    rows.filter(total__gt=0).update(
+        percent=Round(F("completed") * 100.0 / F("total"), 2)
+    )
+    rows.filter(total=0).update(percent=0)
+
+
+def apply_lecture_removal(course_id, completed_student_ids, batch_size=1000):
+    """
+    A lecture was deleted: every student's total drops by one and those who
+    had completed it lose that completion, in a handful of bulk UPDATEs
+    however many students the course has.
+    """
+    student_ids = list(completed_student_ids)
+    rows = CourseProgress.objects.filter(course_id=course_id)
+
+    with transaction.atomic():
+        for start in range(0, len(student_ids), batch_size):
+            rows.filter(
+                student_id__in=student_ids[start:start + batch_size],
+                completed__gt=0
+            ).update(completed=F("completed") - 1)
+        apply_lecture_count_delta(course_id, -1)
+
+
+def get_progress_map(student_course_pairs):
+    """
+    {(student_id, course_id): CourseProgress} in one query;
+    summaries that do not exist yet are created on the spot.
+    """
+    pairs = set(student_course_pairs)
+    if not pairs:
+        return {}
+
+    student_ids = {s for s, _ in pairs}
+    course_ids = {c for _, c in pairs}
+
+    progress_map = {
+        (p.student_id, p.course_id): p
+        for p in CourseProgress.objects.filter(
+            student_id__in=student_ids,
+            course_id__in=course_ids
+        )
+        if (p.student_id, p.course_id) in pairs
+    }
+
+    for student_id, course_id in pairs - set(progress_map):
+        progress_map[(student_id, course_id)] = refresh_course_progress(student_id, course_id)
+
+    return progress_map
+
+
+def get_course_progress(student, course):
+    return get_progress_map([(student.id, course.id)])[(student.id, course.id)]
+
+
+def rebuild_course_progress(course_ids=None, batch_size=1000):
+    """
+    Recompute every enrollment's summary (optionally only for some courses)
+    from two grouped counts, written with bulk_create/bulk_update.
+    Returns the number of rows written.
+    """
+    enrollments = Enrollment.objects.all()
+    lectures = Lecture.objects.all()
+    done = LectureProgress.objects.filter(completed=True)
+    existing = CourseProgress.objects.all()
+
+    if course_ids:
+        enrollments = enrollments.filter(course_id__in=course_ids)
+        lectures = lectures.filter(module__course_id__in=course_ids)
+        done = done.filter(lecture__module__course_id__in=course_ids)
+        existing = existing.filter(course_id__in=course_ids)
+
+    totals = dict(
+        lectures.values("module__course_id")
+        .annotate(n=Count("id"))
+        .values_list("module__course_id", "n")
+    )
+    completed = {
+        (row["student_id"], row["lecture__module__course_id"]): row["n"]
+        for row in done.values("student_id", "lecture__module__course_id")
+        .annotate(n=Count("id"))
+    }
+    existing = {(p.student_id, p.course_id): p for p in existing}
+
+    to_create, to_update = [], []
+    for student_id, course_id in enrollments.values_list("student_id", "course_id"):
+        total = totals.get(course_id, 0)
+        count = min(completed.get((student_id, course_id), 0), total)
+
+        progress = existing.get((student_id, course_id))
+        if progress is None:
+            progress = CourseProgress(student_id=student_id, course_id=course_id)
+            to_create.append(progress)
+        else:
+            to_update.append(progress)
+
+        progress.completed = count
+        progress.total = total
+        progress.percent = _percent(count, total)
+
+    with transaction.atomic():
+        CourseProgress.objects.bulk_create(to_create, batch_size=batch_size)
+        CourseProgress.objects.bulk_update(
+            to_update, ["completed", "total", "percent"], batch_size=batch_size
+        )
+
+    return len(to_create) + len(to_update)
@@ -2,6 +2,7 @@ from django.db.models import Q, Count
 from courses.models import Course
 from users.models import CourseSearch
 from courses.models import Enrollment
+from courses.services.catalog_search import matching_course_ids
 
 def get_recommended_courses(user):
     """
@@ -19,9 +20,9 @@ def get_recommended_courses(user):
         .values_list("course__category", flat=True)
     )
 
-    recent_searches = CourseSearch.objects.filter(
+    recent_searches = list(CourseSearch.objects.filter(
         user=user
-    ).order_by("-searched_at").values_list("keyword", flat=True)[:10]
+    ).order_by("-searched_at").values_list("keyword", flat=True)[:10])
 
     preference_q = Q()
     category_intent = set()
@@ -33,10 +34,10 @@ def get_recommended_courses(user):
         ).values_list("category", flat=True)
     )
 
-    for keyword in set(recent_searches):
-        preference_q |= Q(title__icontains=keyword)
-        preference_q |= Q(description__icontains=keyword)
+    if recent_searches:
+        preference_q |= Q(id__in=matching_course_ids(recent_searches))
 
+    for keyword in set(recent_searches):
         for category in all_categories:
             if keyword.lower() == category.lower():
                 category_intent.add(category)
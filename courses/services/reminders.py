@@ -0,0 +1,152 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import CourseEvent, Enrollment, LiveClass, Notification, ReminderDelivery
+from courses.services.notifications import NOTIFY_BATCH_SIZE
+
+REMINDER_LEAD = timedelta(minutes=30)
+
+
+def reset_live_class_reminders(live_class):
+    """
+    Called after a live class moved to a new start time: everyone is
+    reminded again before the new start.
+    """
+    ReminderDelivery.objects.filter(live_class=live_class).delete()
+    LiveClass.objects.filter(id=live_class.id).update(reminder_sent=False)
+    live_class.reminder_sent = False
+
+
+def _recipients(items, students):
+    """
+    (item, user_id, is_instructor) for every enrolled student and the instructor.
+    """
+    for item, instructor_id in items:
+        for student_id in students.get(item.course_id, []):
+            yield item, student_id, False
+        yield item, instructor_id, True
+
+
+def send_due_reminders(now=None):
+    """
+    One scheduler tick: every live class and event starting within
+    REMINDER_LEAD reminds each enrolled student and its instructor once.
+
+    Due items come from the indexed start_at/start_time columns; who was
+    already reminded comes from the ReminderDelivery ledger, so students
+    enrolling inside the window are picked up on the next tick.
+    Returns (items, notifications).
+    """
+    now = now or timezone.now()
+    cutoff = now + REMINDER_LEAD
+
+    live_classes = list(LiveClass.objects.filter(start_at__gt=now, start_at__lte=cutoff))
+    events = list(
+        CourseEvent.objects.filter(start_time__gt=now, start_time__lte=cutoff)
+        .select_related("course")
+    )
+
+    if not live_classes and not events:
+        return 0, 0
+
+    course_ids = {c.course_id for c in live_classes} | {e.course_id for e in events}
+    students = {}
+    for course_id, student_id in Enrollment.objects.filter(
+        course_id__in=course_ids
+    ).values_list("course_id", "student_id"):
+        students.setdefault(course_id, []).append(student_id)
+
+    delivered = set(
+        ReminderDelivery.objects.filter(live_class__in=live_classes)
+        .values_list("live_class_id", "user_id")
+    )
+    delivered_events = set(
+        ReminderDelivery.objects.filter(event__in=events)
+        .values_list("event_id", "user_id")
+    )
+
+    student_url = reverse("student:student_upcoming_classes")
+    instructor_url = reverse("instructor:calendar_view")
+
+    # (delivery, notification) per recipient not reminded yet
+    pending = []
+
+    for cls, user_id, is_instructor in _recipients(
+        [(c, c.instructor_id) for c in live_classes], students
+    ):
+        if (cls.id, user_id) in delivered:
+            continue
+        delivered.add((cls.id, user_id))
+
+        if is_instructor:
+            message = f"Reminder: Your live class '{cls.topic}' starts in 30 minutes."
+        else:
+            message = f"Reminder: Live class '{cls.topic}' starts in 30 minutes."
+
+        pending.append((
+            ReminderDelivery(user_id=user_id, live_class=cls, sent_at=now),
+            Notification(
+                user_id=user_id,
+                message=message,
+                url=instructor_url if is_instructor else student_url
+            ),
+        ))
+
+    for event, user_id, is_instructor in _recipients(
+        [(e, e.course.instructor_id) for e in events], students
+    ):
+        if (event.id, user_id) in delivered_events:
+            continue
+        delivered_events.add((event.id, user_id))
+
+        if is_instructor:
+            message = f"Reminder: Your event '{event.title}' starts in 30 minutes."
+        else:
+            message = f"Reminder: Event '{event.title}' starts in 30 minutes."
+
+        pending.append((
+            ReminderDelivery(user_id=user_id, event=event, sent_at=now),
+            Notification(
+                user_id=user_id,
+                message=message,
+                url=instructor_url if is_instructor else student_url
+            ),
+        ))
+
+    if not pending:
+        return 0, 0
+
+    with transaction.atomic():
+        # an overlapping tick may have claimed some recipients already;
+        # the ledger rows carrying this tick's sent_at are the ones we own
+        ReminderDelivery.objects.bulk_create(
+            [delivery for delivery, _ in pending],
+            batch_size=NOTIFY_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        claimed = set(
+            ReminderDelivery.objects.filter(sent_at=now)
+            .filter(Q(live_class__in=live_classes) | Q(event__in=events))
+            .values_list("live_class_id", "event_id", "user_id")
+        )
+        pending = [
+            (delivery, notification) for delivery, notification in pending
+            if (delivery.live_class_id, delivery.event_id, delivery.user_id) in claimed
+        ]
+        notifications = [notification for _, notification in pending]
+        Notification.objects.bulk_create(notifications, batch_size=NOTIFY_BATCH_SIZE)
+        LiveClass.objects.filter(
+            id__in=[c.id for c in live_classes], reminder_sent=False
+        ).update(reminder_sent=True)
+        CourseEvent.objects.filter(
+            id__in=[e.id for e in events], reminder_sent=False
+        ).update(reminder_sent=True)
+
+    items = len({d.live_class_id for d, _ in pending if d.live_class_id}) + len(
+        {d.event_id for d, _ in pending if d.event_id}
+    )
+    return items, len(notifications)
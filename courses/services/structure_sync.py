@@ -0,0 +1,234 @@
+from django.db import transaction
+
+from courses.models import Assignment, Lecture, LiveClass, Module
+from courses.services.outline import invalidate_course_outline
+from courses.services.progress import apply_lecture_count_delta
+from quizzes.models import Quiz
+
+BATCH_SIZE = 500
+
+
+def _module_fields(item, index, row):
+    fields = {"module_order": index}
+    if row is None:
+        fields["title"] = item.get("title", "Module")
+        fields["description"] = item.get("description", "")
+    else:
+        fields["title"] = item.get("title", row.title)
+        fields["description"] = item.get("description", row.description)
+    return fields
+
+
+def _quiz_fields(item, index, row):
+    return {
+        "quiz_order": index,
+        "title": item.get("title", "Quiz" if row is None else row.title),
+    }
+
+
+def _assignment_fields(item, index, row):
+    fields = {"assignment_order": index}
+    if row is None:
+        fields["title"] = item.get("title", "Assignment")
+    return fields
+
+
+def _liveclass_fields(item, index, row):
+    return {
+        "live_class_order": index,
+        "topic": item.get("title", "Live Class" if row is None else row.topic),
+    }
+
+
+# structure_json item type -> (model, id key in the item, desired fields)
+STRUCTURE_TYPES = {
+    "Module": (Module, "module_id", _module_fields),
+    "Quiz": (Quiz, "quiz_id", _quiz_fields),
+    "Assignment": (Assignment, "assignment_id", _assignment_fields),
+    "LiveClass": (LiveClass, "liveclass_id", _liveclass_fields),
+}
+
+
+ORDER_FIELDS = {
+    Module: "module_order",
+    Quiz: "quiz_order",
+    Assignment: "assignment_order",
+    LiveClass: "live_class_order",
+}
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _bulk_create(model, course, rows):
+    """
+    bulk_create and make sure the rows carry their ids; MySQL does not
+    return them, so the course's newest ids are read back (one multi-row
+    INSERT hands out ascending ids in row order).
+    """
+    if not rows:
+        return
+
+    model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    if all(row.pk for row in rows):
+        return
+
+    ids = list(
+        model.objects.filter(course=course)
+        .order_by("-id")
+        .values_list("id", flat=True)[:len(rows)]
+    )
+    for row, pk in zip(rows, reversed(ids)):
+        row.pk = pk
+
+
+def sync_course_structure(course, structure, reorder_only=False):
+    """
+    Make the course's modules, quizzes, assignments and live classes match
+    `structure` (the builder's item list) and return it with the ids of
+    newly created rows filled in.
+
+    Rows are loaded with one query per type; new rows are bulk-created,
+    changed titles and orders bulk-updated, unchanged rows left alone, all
+    in one transaction. Ids that do not belong to this course are treated
+    as new items.
+
+    Live classes need a date and time, so items without an existing live
+    class stay as they are; live classes are scheduled from their own form.
+
+    With reorder_only=True only the order columns are written and nothing
+    is created.
+    """
+    structure = [dict(item) for item in structure or []]
+
+    wanted = {}
+    for item in structure:
+        spec = STRUCTURE_TYPES.get(item.get("type"))
+        if spec:
+            model, id_key, _ = spec
+            item_id = _as_int(item.get(id_key))
+            if item_id:
+                wanted.setdefault(model, set()).add(item_id)
+
+    with transaction.atomic():
+        rows = {
+            model: model.objects.filter(course=course).in_bulk(ids)
+            for model, ids in wanted.items()
+        }
+
+        to_create = {}
+        to_update = {}
+        claimed = set()
+
+        for index, item in enumerate(structure):
+            spec = STRUCTURE_TYPES.get(item.get("type"))
+            if not spec:
+                continue
+            model, id_key, desired = spec
+
+            row = rows.get(model, {}).get(_as_int(item.get(id_key)))
+            if row is not None and (model, row.pk) in claimed:
+                row = None
+
+            if row is None:
+                if reorder_only:
+                    continue
+                item[id_key] = None
+                if model is LiveClass:
+                    continue
+                row = model(course=course, **desired(item, index, None))
+                to_create.setdefault(model, []).append((item, id_key, row))
+            else:
+                claimed.add((model, row.pk))
+                changed = []
+                values = desired(item, index, row)
+                if reorder_only:
+                    values = {ORDER_FIELDS[model]: index}
+                for field, value in values.items():
+                    if getattr(row, field) != value:
+                        setattr(row, field, value)
+                        changed.append(field)
+                if changed:
+                    fields, objs = to_update.setdefault(model, (set(), []))
+                    fields.update(changed)
+                    objs.append(row)
+
+            if model is Quiz:
+                item["scope"] = item.get("scope", "all_before")
+
+        for model, pending in to_create.items():
+            _bulk_create(model, course, [row for _, _, row in pending])
+            for item, id_key, row in pending:
+                item[id_key] = row.pk
+
+        for model, (fields, objs) in to_update.items():
+            model.objects.bulk_update(objs, sorted(fields), batch_size=BATCH_SIZE)
+
+        if to_create or to_update:
+            transaction.on_commit(lambda: invalidate_course_outline(course.id))
+
+    return structure
+
+
+def sync_module_lectures(module, lectures):
+    """
+    Make the module's lectures match `lectures`, a list of
+    {"title", "video", "file"} in display order (files may be None).
+    Lectures are matched by position. Titles and orders go out in one
+    bulk_update, new lectures without uploads in one bulk_create and
+    surplus lectures in one delete. Rows receiving an upload are saved
+    one by one so the storage backend writes the file.
+    """
+    with transaction.atomic():
+        existing = list(module.lectures.all().order_by("lecture_order", "id"))
+
+        changed = []
+        created = []
+        with_files = []
+
+        for i, data in enumerate(lectures):
+            title = data.get("title") or f"Lecture {i + 1}"
+            video = data.get("video")
+            pdf = data.get("file")
+
+            if i < len(existing):
+                lecture = existing[i]
+                dirty = lecture.title != title or lecture.lecture_order != i
+                lecture.title = title
+                lecture.lecture_order = i
+            else:
+                lecture = Lecture(module=module, title=title, lecture_order=i)
+                dirty = True
+
+            if video:
+                lecture.video = video
+            if pdf:
+                lecture.file = pdf
+
+            if video or pdf:
+                with_files.append(lecture)
+            elif lecture.pk is None:
+                created.append(lecture)
+            elif dirty:
+                changed.append(lecture)
+
+        for lecture in with_files:
+            # signals keep CourseProgress totals and the outline in step
+            lecture.save()
+
+        if created:
+            Lecture.objects.bulk_create(created, batch_size=BATCH_SIZE)
+            apply_lecture_count_delta(module.course_id, len(created))
+
+        Lecture.objects.bulk_update(changed, ["title", "lecture_order"], batch_size=BATCH_SIZE)
+
+        surplus = [lecture.id for lecture in existing[len(lectures):]]
+        if surplus:
+            Lecture.objects.filter(id__in=surplus).delete()
+
+        if created or changed:
+            transaction.on_commit(lambda: invalidate_course_outline(module.course_id))
@@ -1,11 +1,32 @@
-from django.db.models.signals import post_save
+import threading
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from django.contrib.auth import get_user_model
 
-from courses.models import Course, Enrollment, Notification
+from courses.models import Assignment, Course, Enrollment, Lecture, LectureProgress, LiveClass, Module
+from courses.services.heartbeats import forget_lecture_course
+from courses.services.interests import (
+    add_category,
+    interested_user_ids,
+    record_search,
+    refresh_categories,
+)
+from courses.services.landing import invalidate_landing
+from courses.services.notifications import notify_users
+from courses.services.outline import invalidate_course_outline
+from courses.services.progress import (
+    apply_completion_delta,
+    apply_lecture_count_delta,
+    apply_lecture_removal,
+    refresh_course_progress,
+)
+from quizzes.models import Quiz
 from users.models import CourseSearch
 
-User = get_user_model()
+
+def _interested_student_ids(instance):
+    # resolved on the notification worker, after commit
+    yield from interested_user_ids(instance).iterator()
 
 
 @receiver(post_save, sender=Course)
@@ -13,41 +34,163 @@ def send_recommendation_notifications(sender, instance, created, **kwargs):
     """
     Notify ONLY when a newly created course matches
     user's explicit preferences (search or enrolled category).
+    Matching and inserts run on the notification worker after commit.
     """
     if not created:
         return
 
-    students = User.objects.filter(role="student")
+    notify_users(
+        _interested_student_ids(instance),
+        "🔥 New course '{title}' matches your interests",
+        url=f"/courses/course/{instance.id}/",
+        title=instance.title,
+    )
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_outline_for_course(sender, instance, **kwargs):
+    invalidate_course_outline(instance.id)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_landing_page(sender, instance, **kwargs):
+    """
+    Approvals, edits and enrollments change the landing page aggregates.
+    """
+    invalidate_landing()
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=Assignment)
+@receiver(post_delete, sender=Assignment)
+@receiver(post_save, sender=LiveClass)
+@receiver(post_delete, sender=LiveClass)
+def invalidate_outline_for_item(sender, instance, **kwargs):
+    """
+    Cached outlines hold these objects, so any change to one
+    (save_course, save_module, delete_module, ...) drops the course's outline.
+    """
+    invalidate_course_outline(instance.course_id)
+
+
+def _lecture_course_id(lecture_id=None, module_id=None):
+    if lecture_id is not None:
+        return (
+            Lecture.objects.filter(id=lecture_id)
+            .values_list("module__course_id", flat=True).first()
+        )
+    return (
+        Module.objects.filter(id=module_id)
+        .values_list("course_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Lecture)
+@receiver(post_delete, sender=Lecture)
+def invalidate_outline_for_lecture(sender, instance, **kwargs):
+    invalidate_course_outline(_lecture_course_id(module_id=instance.module_id))
+    forget_lecture_course(instance.id)
+
+
+# ---------------------------------------------------------------------
+# CourseProgress upkeep
+# ---------------------------------------------------------------------
+
+# lectures whose delete is cascading in this thread; their LectureProgress
+# rows are accounted for in one pass by update_progress_on_lecture_removed
+_cascade = threading.local()
+
+
+def _cascading_lectures():
+    if not hasattr(_cascade, "lecture_ids"):
+        _cascade.lecture_ids = set()
+    return _cascade.lecture_ids
+
+
+@receiver(pre_save, sender=LectureProgress)
+def remember_lecture_completion(sender, instance, **kwargs):
+    instance._was_completed = bool(
+        instance.pk and LectureProgress.objects.filter(
+            pk=instance.pk, completed=True
+        ).exists()
+    )
+
+
+@receiver(post_save, sender=LectureProgress)
+def update_progress_on_lecture_save(sender, instance, **kwargs):
+    delta = int(bool(instance.completed)) - int(getattr(instance, "_was_completed", False))
+    if delta:
+        course_id = _lecture_course_id(lecture_id=instance.lecture_id)
+        if course_id:
+            apply_completion_delta(instance.student_id, course_id, delta)
+
+
+@receiver(post_delete, sender=LectureProgress)
+def update_progress_on_lecture_undo(sender, instance, **kwargs):
+    if instance.completed and instance.lecture_id not in _cascading_lectures():
+        course_id = _lecture_course_id(lecture_id=instance.lecture_id)
+        if course_id:
+            apply_completion_delta(instance.student_id, course_id, -1)
+
+
+@receiver(post_save, sender=Lecture)
+def update_progress_on_lecture_added(sender, instance, created, **kwargs):
+    if created:
+        course_id = _lecture_course_id(module_id=instance.module_id)
+        if course_id:
+            apply_lecture_count_delta(course_id, 1)
+
+
+@receiver(pre_delete, sender=Lecture)
+def collect_progress_on_lecture_delete(sender, instance, **kwargs):
+    """
+    Runs before the cascade, while the module and the progress rows exist.
+    """
+    instance._progress_course_id = _lecture_course_id(module_id=instance.module_id)
+    instance._completed_by = list(
+        LectureProgress.objects.filter(lecture=instance, completed=True)
+        .values_list("student_id", flat=True)
+    )
+    _cascading_lectures().add(instance.id)
+
+
+@receiver(post_delete, sender=Lecture)
+def update_progress_on_lecture_removed(sender, instance, **kwargs):
+    _cascading_lectures().discard(instance.id)
+    course_id = getattr(instance, "_progress_course_id", None)
+    if course_id:
+        apply_lecture_removal(course_id, getattr(instance, "_completed_by", []))
+
+
+@receiver(post_save, sender=Enrollment)
+def create_progress_on_enrollment(sender, instance, created, **kwargs):
+    if created:
+        refresh_course_progress(instance.student_id, instance.course_id)
 
-    for student in students:
-        should_notify = False
 
-        recent_searches = CourseSearch.objects.filter(
-            user=student
-        ).order_by("-searched_at").values_list("keyword", flat=True)[:10]
+# ---------------------------------------------------------------------
+# Interest index upkeep
+# ---------------------------------------------------------------------
 
-        for keyword in recent_searches:
-            kw = keyword.lower()
+@receiver(post_save, sender=CourseSearch)
+def index_search_keyword(sender, instance, created, **kwargs):
+    if created:
+        record_search(instance.user_id, instance.keyword)
 
-            if (
-                kw in instance.title.lower()
-                or kw in instance.description.lower()
-                or kw == instance.category.lower()
-            ):
-                should_notify = True
-                break
 
-        if not should_notify:
-            enrolled_categories = Enrollment.objects.filter(
-                student=student
-            ).values_list("course__category", flat=True)
+@receiver(post_save, sender=Enrollment)
+def index_enrolled_category(sender, instance, created, **kwargs):
+    if created:
+        add_category(instance.student_id, instance.course.category)
 
-            if instance.category in enrolled_categories:
-                should_notify = True
 
-        if should_notify:
-            Notification.objects.create(
-                user=student,
-                message=f"🔥 New course '{instance.title}' matches your interests",
-                url=f"/courses/course/{instance.id}/"
-            )
+@receiver(post_delete, sender=Enrollment)
+def unindex_enrolled_category(sender, instance, **kwargs):
+    refresh_categories(instance.student_id)
@@ -29,12 +29,14 @@ urlpatterns = [
 
     # Public (KEEP LAST)
     path("", views.course_list, name="course_list"),
+    path("certificates/verify/<uuid:certificate_id>/", views.verify_certificate, name="verify_certificate"),
     # admin
     path('admin-approve/<int:course_id>/', views.admin_approve_course, name='admin_approve_course'),
     path('admin-reject/<int:course_id>/', views.admin_reject_course, name='admin_reject_course'),
     path('admin-notifications/', views.admin_notifications, name='admin_notifications'),
     path('admin-notifications/read/<int:notif_id>/', views.mark_admin_notification_read, name='mark_admin_notification_read'),
     path('admin-notifications/read-all/', views.mark_all_admin_notifications_read, name='mark_all_admin_notifications_read'),
+    path('admin-notifications/stats/', views.admin_notification_stats, name='admin_notification_stats'),
     path("admin-course/<int:course_id>/", views.admin_course_detail, name="admin_course_detail"),
     path('admin-courses/', views.admin_courses, name='admin_courses'),
 
@@ -1,4 +1,3 @@
-from io import BytesIO
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
@@ -6,10 +5,9 @@ from django.urls import reverse
 from django.utils.dateparse import parse_datetime, parse_date, parse_time
 from django.views.decorators.csrf import csrf_exempt
 from fastapi import requests
-from courses.utils import check_and_send_reminders
 from quizzes.models import Quiz, QuizChoice, QuizQuestion, QuizResult
 from .models import Assignment, Course, CourseBlock, Enrollment, Certificate, Lecture, LectureProgress, Feedback, CourseEvent, Module, LiveClass, LectureQuestion, Notification, QuestionReply, CourseReview, LiveClassAttendance, AssignmentQuestion, StudentAssignment, StudentAnswer
-from quizzes.models import Quiz, QuizChoice, QuizQuestion, QuizResult, StudentAnswer
+from quizzes.models import Quiz, QuizAttempt, QuizChoice, QuizQuestion, QuizResult, StudentAnswer
 from users.utils import admin_required
 from .models import AdminComment, Assignment, Course, CourseBlock, Enrollment, Certificate, Lecture, LectureProgress, Feedback, CourseEvent, Module, LiveClass, LectureQuestion, Notification, QuestionReply, CourseReview, LiveClassAttendance
 from users.models import CourseSearch, LoginHistory, User
@@ -19,12 +17,20 @@ from django.db.models import Q, Count, Sum ,Avg
 from users.models import Profile
 from datetime import date
 from django.utils import timezone
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from django.http import FileResponse, HttpResponseForbidden, JsonResponse
+from django.http import FileResponse, Http404, HttpResponseForbidden, JsonResponse
 import json
-from django.db.models import Prefetch
+from django.db.models import Prefetch, prefetch_related_objects
 from courses.services.recommendation_service import get_recommended_courses
+from courses.services.catalog_search import search_courses
+from courses.services.certificates import full_name, is_course_completed, issue_certificate
+from courses.services.heartbeats import discard_heartbeat, last_positions, lecture_course_id, record_heartbeat
+from courses.services.media_stream import can_stream, is_enrolled_cached, stream_file
+from courses.services.outline import resolve_course_outline
+from courses.services.progress import get_course_progress, get_progress_map
+from courses.services.reminders import reset_live_class_reminders
+from courses.services.structure_sync import sync_course_structure, sync_module_lectures
+from quizzes.services.persistence import sync_questions
+from courses.services.notifications import fanout_stats, notify_users
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth import update_session_auth_hash
 from django.core.mail import send_mail
@@ -65,10 +71,8 @@ def course_list(request):
             keyword=query.lower()
         )
 
-        courses = courses.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query)
-        )
+    if query:
+        courses = search_courses(courses, query)
 
     if category:
         courses = courses.filter(category=category)
@@ -212,6 +216,11 @@ def student_course_detail(request, course_id):
             question__quiz__course=course
         ).delete()
 
+        QuizAttempt.objects.filter(
+            student=request.user,
+            quiz__course=course
+        ).delete()
+
         from django.contrib import messages
         messages.error(
             request,
@@ -230,6 +239,11 @@ def student_course_detail(request, course_id):
 
     progress_map = completed_lectures
 
+    resume_positions = last_positions(
+        request.user.id,
+        lectures.exclude(id__in=completed_lectures).values_list("id", flat=True)
+    )
+
     total = lectures.count()
     completed = len(completed_lectures)
     progress_percent = round((completed / total * 100), 2) if total else 0
@@ -243,20 +257,17 @@ def student_course_detail(request, course_id):
     }
 
     ordered_items = []
-    structure = course.structure_json or []
 
     previous_completed = True
 
     module_count = quiz_count = assignment_count = live_count = 1
 
-    for item in structure:
-        item_type = item.get("type")
-        title = (item.get("display_title") or "").strip()
+    for entry in resolve_course_outline(course):
+        item_type = entry["type"]
+        title = (entry["item"].get("display_title") or "").strip()
 
         if item_type == "Module":
-            module = Module.objects.filter(id=item.get("module_id")).first()
-            if not module:
-                continue
+            module = entry["obj"]
 
             module_lectures = module.lectures.all()
             completed_item = all(l.id in completed_lectures for l in module_lectures)
@@ -275,9 +286,7 @@ def student_course_detail(request, course_id):
             module_count += 1
 
         elif item_type == "Quiz":
-            quiz = Quiz.objects.filter(id=item.get("quiz_id")).first()
-            if not quiz:
-                continue
+            quiz = entry["obj"]
 
             result = quiz_results.get(quiz.id)
 
@@ -306,11 +315,7 @@ def student_course_detail(request, course_id):
             quiz_count += 1
 
         elif item_type == "Assignment":
-            assignment = Assignment.objects.filter(
-                id=item.get("assignment_id")
-            ).first()
-            if not assignment:
-                continue
+            assignment = entry["obj"]
 
             unlocked = previous_completed
 
@@ -325,18 +330,14 @@ def student_course_detail(request, course_id):
             assignment_count += 1
 
         elif item_type == "LiveClass":
-            live = LiveClass.objects.filter(
-                id=item.get("liveclass_id")
-            ).first()
-            if not live:
-                continue
+            live = entry["obj"]
 
             unlocked = previous_completed
 
             ordered_items.append({
                 "type": "live",
                 "obj": live,
-                "title": title if title else live.title,
+                "title": title if title else live.topic,
                 "unlocked": unlocked,
             })
 
@@ -353,6 +354,7 @@ def student_course_detail(request, course_id):
             "completed": completed,
             "progress_percent": progress_percent,
             "progress_map": progress_map,
+            "resume_positions": resume_positions,
         }
     )
 
@@ -387,44 +389,77 @@ def mark_lecture_complete(request, lecture_id):
     return redirect('student:student_course_detail', course_id=lecture.module.course.id)
 
 
+@login_required
+def stream_lecture_video(request, lecture_id):
+    """Lecture video with Range support, for enrolled students and the course staff."""
+    lecture = get_object_or_404(Lecture.objects.select_related("module__course"), id=lecture_id)
+    course = lecture.module.course
+
+    if not lecture.video:
+        raise Http404("This lecture has no video.")
+
+    if not can_stream(request, course):
+        return HttpResponseForbidden("Enroll in this course to watch its lectures.")
+
+    return stream_file(request, lecture.video)
+
+
 @login_required(login_url='/student/login/')
 def auto_mark_complete(request, lecture_id):
     """Auto-mark lecture complete when video ends and update progress bar."""
     if request.method == "POST":
-        lecture = get_object_or_404(Lecture, id=lecture_id)
-        course = lecture.module.course
+        course_id = lecture_course_id(lecture_id)
+        if course_id is None:
+            raise Http404("Lecture not found.")
 
-        watched_time = float(request.POST.get("watched_time", 0))
         duration = float(request.POST.get("duration", 0))
 
-        progress, created = LectureProgress.objects.update_or_create(
+        # completion is written immediately; the course summary follows via signals
+        discard_heartbeat(request.user.id, lecture_id)
+        LectureProgress.objects.update_or_create(
             student=request.user,
-            lecture=lecture,
+            lecture_id=lecture_id,
             defaults={
                 "completed": True,
-                "last_position": duration  
+                "progress": 100.0,
+                "duration": duration,
+                "last_position": duration
             }
         )
 
-        total_lectures = Lecture.objects.filter(module__course=course).count()
-        completed_lectures = LectureProgress.objects.filter(
-            student=request.user,
-            lecture__module__course=course,
-            completed=True
-        ).count()
-        progress_percent = round((completed_lectures / total_lectures * 100), 2) if total_lectures > 0 else 0
+        course_progress = get_progress_map([(request.user.id, course_id)])[(request.user.id, course_id)]
 
         return JsonResponse({
             "status": "success",
             "message": "Lecture marked complete.",
-            "completed": completed_lectures,
-            "total": total_lectures,
-            "progress_percent": progress_percent
+            "completed": course_progress.completed,
+            "total": course_progress.total,
+            "progress_percent": course_progress.percent
         })
 
     return JsonResponse({"status": "error", "message": "Invalid request."}, status=400)
 
 
+@login_required(login_url='/student/login/')
+def lecture_heartbeat(request, lecture_id):
+    """Player position ping; buffered and written to LectureProgress in batches."""
+    if request.method != "POST":
+        return JsonResponse({"status": "error", "message": "Invalid request."}, status=400)
+
+    course_id = lecture_course_id(lecture_id)
+    if course_id is None or not is_enrolled_cached(request, course_id):
+        return JsonResponse({"status": "error", "message": "Not enrolled."}, status=403)
+
+    try:
+        position = float(request.POST.get("position", 0))
+        duration = float(request.POST.get("duration", 0))
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "Invalid position."}, status=400)
+
+    record_heartbeat(request.user.id, lecture_id, position, duration)
+    return JsonResponse({"status": "ok"})
+
+
 @login_required(login_url='/login/')
 def undo_lecture_completion(request, lecture_id):
     """Student: undo completed lecture"""
@@ -450,22 +485,13 @@ def student_progress(request, course_id):
     enrollment = get_object_or_404(Enrollment, course_id=course_id, student=request.user)
     course = enrollment.course
 
-    lectures = Lecture.objects.filter(module__course=course)
-    total = lectures.count()
-
-    completed = LectureProgress.objects.filter(
-        student=request.user,
-        lecture__in=lectures,
-        completed=True
-    ).count() if total > 0 else 0
-
-    progress_percent = round((completed / total * 100), 2) if total else 0
+    course_progress = get_course_progress(request.user, course)
 
     context = {
         'course': course,
-        'total': total,
-        'completed': completed,
-        'progress_percent': progress_percent,
+        'total': course_progress.total,
+        'completed': course_progress.completed,
+        'progress_percent': course_progress.percent,
     }
 
     return render(request, 'courses/student/student_course_progress.html', context)
@@ -611,52 +637,48 @@ def upvote_reply(request, reply_id):
 def get_certificate(request, course_id):
     course = get_object_or_404(Course, id=course_id)
     user = request.user
-    lectures = Lecture.objects.filter(module__course=course)
-    total = lectures.count()
-    completed = LectureProgress.objects.filter(student=user, lecture__in=lectures, completed=True).count()
-
-    if total == 0 or completed < total:
-        messages.warning(request, "You must complete all lectures to get your certificate.")
-        return redirect('student:student_course_detail', course_id)
 
-    certificate, created = Certificate.objects.get_or_create(student=user, course=course)
+    # an issued certificate is served as stored; no progress check, no rendering
+    certificate = Certificate.objects.filter(student=user, course=course).first()
 
-    certificate.downloaded_at = timezone.now()
-    certificate.save()
+    if certificate is None or not certificate.pdf:
+        if not is_course_completed(user, course):
+            messages.warning(request, "You must complete all lectures to get your certificate.")
+            return redirect('student:student_course_detail', course_id)
 
-    buffer = BytesIO()
-    p = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
+        certificate = issue_certificate(user, course)
 
-    p.setFont("Helvetica-Bold", 28)
-    p.drawCentredString(width/2, height - 150, "Certificate of Completion")
-
-    p.setFont("Helvetica", 16)
-    p.drawCentredString(width/2, height - 200, "This is to certify that")
-
-    p.setFont("Helvetica-Bold", 20)
-    full_name = f"{user.first_name} {user.last_name}".strip() or user.username
-    p.drawCentredString(width/2, height - 250, full_name)
-
-    p.setFont("Helvetica", 16)
-    p.drawCentredString(width/2, height - 300, "has successfully completed the course")
-
-    p.setFont("Helvetica-Bold", 20)
-    p.drawCentredString(width/2, height - 340, course.title)
+    if certificate.downloaded_at is None:
+        Certificate.objects.filter(id=certificate.id, downloaded_at__isnull=True).update(
+            downloaded_at=timezone.now()
+        )
 
-    p.setFont("Helvetica", 12)
-    p.drawCentredString(width/2, height - 400, f"Issued on: {certificate.issued_on.strftime('%B %d, %Y')}")
-    p.drawCentredString(width/2, height - 420, f"Certificate ID: {certificate.certificate_id}")
+    return FileResponse(
+        certificate.pdf.open("rb"),
+        as_attachment=True,
+        filename=f"{course.title}_Certificate.pdf"
+    )
 
-    p.line(150, height - 500, width - 150, height - 500)
-    p.setFont("Helvetica-Oblique", 12)
-    p.drawCentredString(width/2, height - 520, "Speshway Learning Platform")
 
-    p.showPage()
-    p.save()
-    buffer.seek(0)
+def verify_certificate(request, certificate_id):
+    """
+    Public lookup of a certificate by the id printed on it.
+    """
+    certificate = (
+        Certificate.objects.select_related("student", "course")
+        .filter(certificate_id=certificate_id)
+        .first()
+    )
+    if certificate is None:
+        return JsonResponse({"valid": False}, status=404)
 
-    return FileResponse(buffer, as_attachment=True, filename=f"{course.title}_Certificate.pdf")
+    return JsonResponse({
+        "valid": True,
+        "certificate_id": str(certificate.certificate_id),
+        "student": full_name(certificate.student),
+        "course": certificate.course.title,
+        "issued_on": certificate.issued_on.isoformat(),
+    })
 
 @login_required
 def my_certificates(request):
@@ -702,65 +724,67 @@ def leave_review(request, course_id):
 # -------------------------------
 # Instructor Views
 # -------------------------------
-@login_required
-def course_detail(request, course_id):
-    course = get_object_or_404(
-        Course, id=course_id, instructor=request.user
-    )
-
+def _outline_items(course):
+    """
+    Instructor/admin view of the course outline, with admin comments
+    on modules loaded in one extra query.
+    """
     ordered_items = []
-    structure = course.structure_json or []
-
     module_count = quiz_count = assignment_count = live_count = 1
 
-    for item in structure:
-        item_type = item.get("type")
+    for entry in resolve_course_outline(course):
+        item_type = entry["type"]
+        item = entry["item"]
+        obj = entry["obj"]
 
         if item_type == "Module":
-            module = course.modules.filter(id=item.get("module_id")).first()
-            if module:
-                ordered_items.append({
-                    "type": "module",
-                    "obj": module,
-                    "title": item.get("title") or f"Module {module_count}"
-                })
-                module_count += 1
+            ordered_items.append({
+                "type": "module",
+                "obj": obj,
+                "title": item.get("title") or f"Module {module_count}"
+            })
+            module_count += 1
 
         elif item_type == "Quiz":
-            quiz_id = item.get("quiz_id")
-            quiz = course.quizzes.filter(id=quiz_id).first()
-            
-            if quiz:
-                title = item.get("title") or quiz.title or f"Quiz {quiz_count}"
-                ordered_items.append({
-                    "type": "quiz",
-                    "obj": quiz,
-                    "title": title,              
-                    "quiz_id": quiz.id,
-                    "display_label": f"Quiz {quiz_count}"  
-                })
-                quiz_count += 1
-
+            ordered_items.append({
+                "type": "quiz",
+                "obj": obj,
+                "title": item.get("title") or obj.title or f"Quiz {quiz_count}",
+                "quiz_id": obj.id,
+                "display_label": f"Quiz {quiz_count}"
+            })
+            quiz_count += 1
 
         elif item_type == "Assignment":
-            assignment = course.assignments.first()
-            if assignment:
-                ordered_items.append({
-                    "type": "assignment",
-                    "obj": assignment,
-                    "title": item.get("title") or f"Assignment {assignment_count}"
-                })
-                assignment_count += 1
+            ordered_items.append({
+                "type": "assignment",
+                "obj": obj,
+                "title": item.get("title") or f"Assignment {assignment_count}"
+            })
+            assignment_count += 1
 
         elif item_type == "LiveClass":
-            live = course.live_classes.first()
-            if live:
-                ordered_items.append({
-                    "type": "live",
-                    "obj": live,
-                    "title": item.get("title") or f"Live Class {live_count}"
-                })
-                live_count += 1
+            ordered_items.append({
+                "type": "live",
+                "obj": obj,
+                "title": item.get("title") or f"Live Class {live_count}"
+            })
+            live_count += 1
+
+    # comments change independently of the outline, so they are not cached
+    modules = [i["obj"] for i in ordered_items if i["type"] == "module"]
+    prefetch_related_objects(modules, "admincomment_set")
+
+    return ordered_items
+
+
+@login_required
+def course_detail(request, course_id):
+    course = get_object_or_404(
+        Course, id=course_id, instructor=request.user
+    )
+
+    ordered_items = _outline_items(course)
 
     return render(
         request,
@@ -839,23 +863,18 @@ def delete_lecture(request, course_id, lecture_id):
 @login_required
 def course_progress_report(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructor=request.user)
-    enrollments = Enrollment.objects.filter(course=course)
+    enrollments = Enrollment.objects.filter(course=course).select_related("student")
     progress_data = []
-    total_lectures = sum(module.lectures.count() for module in course.modules.all())
+    progress_map = get_progress_map((e.student_id, course.id) for e in enrollments)
 
     for enrollment in enrollments:
         student = enrollment.student
-        completed = LectureProgress.objects.filter(
-            student=student,
-            lecture__module__course=course,  
-            completed=True
-        ).count()
-        progress = (completed / total_lectures * 100) if total_lectures else 0
+        course_progress = progress_map[(student.id, course.id)]
         progress_data.append({
             "student": student,
-            "completed": completed,
-            "total": total_lectures,
-            "progress": progress
+            "completed": course_progress.completed,
+            "total": course_progress.total,
+            "progress": course_progress.percent
         })
 
     return render(request, 'courses/instructor/course_progress_report.html', {
@@ -884,14 +903,13 @@ def add_event(request):
             event.course = course
             event.save()
 
-            students = Enrollment.objects.filter(course=course).values_list("student_id", flat=True)
-            for student_id in students:
-                Notification.objects.create(
-                    user_id=student_id,
-                    message=f"New Event: {event.title} ({course.title})",
-                    url=reverse("student:student_upcoming_classes")
-
-                )
+            notify_users(
+                Enrollment.objects.filter(course=course).values_list("student_id", flat=True),
+                "New Event: {title} ({course})",
+                url=reverse("student:student_upcoming_classes"),
+                title=event.title,
+                course=course.title,
+            )
 
             messages.success(request, "Event created successfully!")
             return redirect("instructor:calendar_view")
@@ -997,6 +1015,7 @@ def my_students(request):
         )
 
     students_map = {}
+    progress_map = get_progress_map((e.student_id, e.course_id) for e in enrollments)
 
     for e in enrollments:
         student = e.student
@@ -1016,15 +1035,7 @@ def my_students(request):
             }
 
         course = e.course
-        lectures = Lecture.objects.filter(module__course=course)
-        total_lectures = lectures.count()
-        completed_lectures = LectureProgress.objects.filter(
-            student=student,
-            lecture__in=lectures,
-            completed=True
-        ).count()
-
-        progress = round((completed_lectures / total_lectures) * 100) if total_lectures else 0
+        progress = round(progress_map[(student.id, course.id)].percent)
 
         students_map[student.id]["courses"].append({
             "course": course,
@@ -1157,35 +1168,14 @@ def save_module(request, module_id):
 
     lecture_count = int(request.POST.get("lecture_count", 0))
 
-    existing_lectures = list(
-        module.lectures.all().order_by("lecture_order", "id")
-    )
-
-    for i in range(lecture_count):
-
-        lec_title = request.POST.get(f"lecture_title_{i}", "").strip()
-        video = request.FILES.get(f"lecture_video_{i}")
-        pdf = request.FILES.get(f"lecture_pdf_{i}")
-
-        if i < len(existing_lectures):
-            lecture = existing_lectures[i]
-        else:
-            lecture = Lecture(module=module)
-
-        lecture.title = lec_title or f"Lecture {i + 1}"
-
-        lecture.lecture_order = i
-
-        if video:
-            lecture.video = video
-        if pdf:
-            lecture.file = pdf
-
-        lecture.save()
-
-    if lecture_count < len(existing_lectures):
-        for lecture in existing_lectures[lecture_count:]:
-            lecture.delete()
+    sync_module_lectures(module, [
+        {
+            "title": request.POST.get(f"lecture_title_{i}", "").strip(),
+            "video": request.FILES.get(f"lecture_video_{i}"),
+            "file": request.FILES.get(f"lecture_pdf_{i}"),
+        }
+        for i in range(lecture_count)
+    ])
 
     return JsonResponse({"status": "success"})
 
@@ -1256,100 +1246,8 @@ def save_course(request):
     if thumbnail:
         course.thumbnail = thumbnail
 
-    course.save()
-
-    updated_structure = []
-
-    for index, item in enumerate(structure):
-
-        block_type = item.get("type")
-
-        if block_type == "Module":
-
-            if item.get("module_id"):
-                module = Module.objects.get(id=item["module_id"])
-                module.title = item.get("title", module.title)
-                module.description = item.get("description", module.description)
-                module.module_order = index
-                module.save()
-
-            else:
-                module = Module.objects.create(
-                    course=course,
-                    title=item.get("title", "Module"),
-                    description=item.get("description", ""),
-                    module_order=index
-                )
-
-                item["module_id"] = module.id
-
-
-        elif block_type == "Quiz":
-
-            if item.get("quiz_id"):
-                quiz = Quiz.objects.get(id=item["quiz_id"], course=course)
-                quiz.title = item.get("title", quiz.title)
-                quiz.quiz_order = index
-                quiz.save()
-
-            else:
-                quiz = Quiz.objects.create(
-                    course=course,
-                    title=item.get("title", "Quiz"),
-                    quiz_order=index
-                )
-
-                item["quiz_id"] = quiz.id
-
-            item["scope"] = item.get("scope", "all_before")
-
-
-        elif block_type == "Assignment":
-
-            assignment_id = item.get("assignment_id")
-
-            if assignment_id:
-                exists = Assignment.objects.filter(
-                    id=assignment_id,
-                    course=course
-                ).exists()
-
-                if not exists:
-                    a = Assignment.objects.create(
-                        course=course,
-                        title=item.get("title", "Assignment")
-                    )
-                    item["assignment_id"] = a.id
-
-            else:
-                a = Assignment.objects.create(
-                    course=course,
-                    title=item.get("title", "Assignment")
-                )
-                item["assignment_id"] = a.id
-
-
-        elif block_type == "LiveClass":
-
-            if item.get("liveclass_id"):
-                lc = LiveClass.objects.get(id=item["liveclass_id"])
-                lc.topic = item.get("title", lc.topic)
-                lc.live_class_order = index
-                lc.save()
-
-            else:
-                lc = LiveClass.objects.create(
-                    course=course,
-                    instructor=request.user,
-                    topic=item.get("title", "Live Class"),
-                    live_class_order=index
-                )
-
-                item["liveclass_id"] = lc.id
-
-
-        updated_structure.append(item)
-
+    # one diff against the stored rows, applied with bulk operations
+    updated_structure = sync_course_structure(course, structure)
 
     course.structure_json = updated_structure
     course.save()
@@ -1379,10 +1277,8 @@ def delete_module(request, module_id):
         if item.get("module_id") != module_id
     ]
 
-    for index, item in enumerate(updated):
-        mid = item.get("module_id")
-        if mid:
-            Module.objects.filter(id=mid).update(module_order=index)
+    # renumbers the remaining blocks with one bulk_update per type
+    updated = sync_course_structure(course, updated, reorder_only=True)
 
     course.structure_json = updated
     course.save()
@@ -1484,20 +1380,11 @@ def add_quiz_question(request, quiz_id):
         course__instructor=request.user
     )
 
-    q = QuizQuestion.objects.create(
-        quiz=quiz,
-        question_text=data["question"],
-        options=data["options"],  
-        correct_answer=data["correct_answer"],
-        is_auto_generated=False
-    )
+    saved = sync_questions(quiz, [{**data, "source": "manual"}])
+    if not saved["questions"]:
+        return JsonResponse({"error": "Question text required"}, status=400)
 
-    for key, text in data["options"].items():
-        QuizChoice.objects.create(
-            question=q,
-            text=text,
-            is_correct=(key == data["correct_answer"])
-        )
+    q = saved["questions"][0]
 
     return JsonResponse({
         "status": "saved",
@@ -1518,11 +1405,13 @@ def edit_quiz(request, course_id, quiz_id):
         course=course
     )
 
-    quiz_block = None
-    for item in course.structure_json or []:
-        if item.get("type") == "Quiz" and item.get("quiz_id") == quiz.id:
-            quiz_block = item
-            break
+    quiz_block = next(
+        (
+            entry["item"] for entry in resolve_course_outline(course)
+            if entry["type"] == "Quiz" and entry["obj"].id == quiz.id
+        ),
+        None
+    )
 
     question_count = quiz.questions.count()
     existing_questions = question_count > 0
@@ -1581,23 +1470,15 @@ def save_quiz(request, course_id, quiz_id):
             "message": "Quiz updated (questions untouched)"
         })
 
-    for q in questions_payload:
-        question = QuizQuestion.objects.create(
-            quiz=quiz,
-            question_text=q["question"],
-            is_auto_generated=(q.get("source") == "ai")
-        )
-
-        for key, text in q["options"].items():
-            QuizChoice.objects.create(
-                question=question,
-                text=text,
-                is_correct=(key == q["correct_answer"])
-            )
+    # questions already on the quiz are matched and only updated if changed
+    saved = sync_questions(quiz, questions_payload)
 
     return JsonResponse({
         "status": "ok",
-        "message": "Quiz, questions, and source preference saved"
+        "message": "Quiz, questions, and source preference saved",
+        "created": saved["created"],
+        "updated": saved["updated"],
+        "unchanged": saved["unchanged"],
     })
 
 
@@ -1641,13 +1522,11 @@ def publish_course(request, course_id):
     course.status = "pending"
     course.save()
 
-    admins = User.objects.filter(is_staff=True)
-
-    for admin in admins:
-        Notification.objects.create(
-            user=admin,
-            message=f"📚 New course '{course.title}' submitted for approval."
-        )
+    notify_users(
+        User.objects.filter(is_staff=True),
+        "📚 New course '{course}' submitted for approval.",
+        course=course.title,
+    )
 
     messages.success(request, "Course submitted for admin approval.")
 
@@ -1679,16 +1558,15 @@ def schedule_live_class(request):
             live_class.reminder_sent = False  
             live_class.save()
 
-            students = Enrollment.objects.filter(
-                course=live_class.course
-            ).values_list("student_id", flat=True)
-
-            for student_id in students:
-                Notification.objects.create(
-                    user_id=student_id,
-                    message=f"New live class scheduled: {live_class.topic} ({live_class.course.title})",
-                    url=reverse("student:student_upcoming_classes")
-                )
+            notify_users(
+                Enrollment.objects.filter(
+                    course=live_class.course
+                ).values_list("student_id", flat=True),
+                "New live class scheduled: {topic} ({course})",
+                url=reverse("student:student_upcoming_classes"),
+                topic=live_class.topic,
+                course=live_class.course.title,
+            )
 
             messages.success(request, 
                 f"✅ Live class '{live_class.topic}' scheduled successfully!"
@@ -1714,21 +1592,23 @@ def edit_live_class(request, class_id):
         time = request.POST.get("time")
         meeting_link = request.POST.get("meeting_link")
 
+        previous_start = liveclass.start_at
         liveclass.topic = topic
         liveclass.date = date
         liveclass.time = time
         liveclass.meeting_link = meeting_link
         liveclass.save()
-        students = Enrollment.objects.filter(
+        if liveclass.start_at != previous_start:
+            reset_live_class_reminders(liveclass)
+        notify_users(
+            Enrollment.objects.filter(
                 course=liveclass.course
-            ).values_list("student_id", flat=True)
-
-        for student_id in students:
-                Notification.objects.create(
-                    user_id=student_id,
-                    message=f"Your live class schedule was modified: {liveclass.topic} ({liveclass.course.title})",
-                    url=reverse("student:student_upcoming_classes")
-                )
+            ).values_list("student_id", flat=True),
+            "Your live class schedule was modified: {topic} ({course})",
+            url=reverse("student:student_upcoming_classes"),
+            topic=liveclass.topic,
+            course=liveclass.course.title,
+        )
 
 
         messages.success(request, "Class updated successfully.")
@@ -1872,25 +1752,16 @@ def course_overview(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructor=request.user)
     enrollments = Enrollment.objects.filter(course=course).select_related("student")
     progress_list = []
-
-    total_lectures = Lecture.objects.filter(module__course=course).count()
+    progress_map = get_progress_map((e.student_id, course.id) for e in enrollments)
 
     for e in enrollments:
-        completed_lectures = LectureProgress.objects.filter(
-            student=e.student,
-            lecture__module__course=course,
-            completed=True
-        ).count()
-
-        percent = 0
-        if total_lectures > 0:
-            percent = int((completed_lectures / total_lectures) * 100)
+        course_progress = progress_map[(e.student_id, course.id)]
 
         progress_list.append({
             "student": e.student,
-            "completed": completed_lectures,
-            "total": total_lectures,
-            "percent": percent,
+            "completed": course_progress.completed,
+            "total": course_progress.total,
+            "percent": int(course_progress.percent),
         })
 
     completed_students = Certificate.objects.filter(course=course)
@@ -2418,72 +2289,15 @@ def mark_all_admin_notifications_read(request):
 
     return redirect("courses:admin_notifications")
 
+@staff_member_required
+def admin_notification_stats(request):
+    return JsonResponse(fanout_stats())
+
 @staff_member_required
 def admin_course_detail(request, course_id):
     course = get_object_or_404(Course, id=course_id)
 
-    ordered_items = []
-    structure = course.structure_json or []
-
-    module_count = quiz_count = assignment_count = live_count = 1
-
-    for item in structure:
-        item_type = item.get("type")
-
-        if item_type == "Module":
-            module = course.modules.filter(
-                id=item.get("module_id")
-            ).prefetch_related("lectures").first()
-
-            if module:
-                ordered_items.append({
-                    "type": "module",
-                    "obj": module,
-                    "title": item.get("title") or f"Module {module_count}"
-                })
-                module_count += 1
-
-        elif item_type == "Quiz":
-            quiz_id = item.get("quiz_id")
-            quiz = course.quizzes.filter(id=quiz_id).first()
-
-            if quiz:
-                title = item.get("title") or quiz.title or f"Quiz {quiz_count}"
-
-                ordered_items.append({
-                    "type": "quiz",
-                    "obj": quiz,
-                    "title": title,
-                    "quiz_id": quiz.id,
-                    "display_label": f"Quiz {quiz_count}"
-                })
-                quiz_count += 1
-
-        elif item_type == "Assignment":
-            assignment = course.assignments.filter(
-                id=item.get("assignment_id")
-            ).first()
-
-            if assignment:
-                ordered_items.append({
-                    "type": "assignment",
-                    "obj": assignment,
-                    "title": item.get("title") or f"Assignment {assignment_count}"
-                })
-                assignment_count += 1
-
-        elif item_type == "LiveClass":
-            live = course.live_classes.filter(
-                id=item.get("liveclass_id")
-            ).first()
-
-            if live:
-                ordered_items.append({
-                    "type": "live",
-                    "obj": live,
-                    "title": item.get("title") or f"Live Class {live_count}"
-                })
-                live_count += 1
+    ordered_items = _outline_items(course)
 
     course_comments = AdminComment.objects.filter(
         course=course,
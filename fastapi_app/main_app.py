@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi_app.dependencies import get_db
 from fastapi_app.routes import quiz, quiz_manual, quiz_rag, ai_assist
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi_app.services.model_registry import model_stats, warm_models
 
 from dotenv import load_dotenv
 import os
@@ -10,6 +11,10 @@ load_dotenv()
 
 print("API_KEY loaded:", bool(os.getenv("API_KEY")))
 
+# Comma-separated model names to load at startup, e.g.
+# WARM_MODELS=sentence_encoder,classifier_agent,whisper  (or "all")
+WARM_MODELS = os.getenv("WARM_MODELS", "")
+
 
 app = FastAPI(title="Speshway API")
 
@@ -33,6 +38,12 @@ app.include_router(quiz_rag.router)
 app.include_router(quiz_manual.router)
 app.include_router(ai_assist.router)
 
+if WARM_MODELS:
+    warm_models(
+        None if WARM_MODELS == "all" else WARM_MODELS.split(","),
+        background=True,
+    )
+
 
 # -------------------------------------------------
 # Health Check
@@ -41,6 +52,10 @@ app.include_router(ai_assist.router)
 def health():
     return {"status": "OK"}
 
+@app.get("/health/models")
+def health_models():
+    return model_stats()
+
 @app.get("/")
 def api_root():
     return {
@@ -1,25 +1,235 @@
-import pickle
-from pathlib import Path
+import json
+import os
+import shutil
 import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+import faiss
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
 
 CACHE_DIR = Path("rag_cache")
-CACHE_DIR.mkdir(exist_ok=True)
+INDEX_DIR = CACHE_DIR / "indexes"
+MANIFEST_DIR = CACHE_DIR / "manifests"
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.json"
+
+MAX_LOADED_STORES = 16
+MAX_FILE_HASHES = 1024
+
+# shared by request handlers and generation/batcher worker threads
+_lock = threading.Lock()
+_loaded_stores = OrderedDict()
+_loading = {}
+_file_hashes = OrderedDict()
+
+
+def _mmap_flags():
+    flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if flag is None:
+        flag = faiss.IO_FLAG_MMAP
+    return flag | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
+
+
+def read_index(path: Path):
+    """
+    Memory-map a FAISS index file; falls back to a plain read
+    for index types this faiss build cannot map.
+    """
+    try:
+        return faiss.read_index(str(path), _mmap_flags())
+    except RuntimeError:
+        return faiss.read_index(str(path))
+
+
+def file_hash(path: Path) -> str | None:
+    """
+    SHA-256 of a file's bytes.
+    Memoized per path on (size, mtime) so unchanged files are hashed once per
+    process; the memo keeps the MAX_FILE_HASHES most recently used paths.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    memo_key = str(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        cached = _file_hashes.get(memo_key)
+        if cached and cached[0] == signature:
+            _file_hashes.move_to_end(memo_key)
+            return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    with _lock:
+        _file_hashes[memo_key] = (signature, digest.hexdigest())
+        _file_hashes.move_to_end(memo_key)
+        while len(_file_hashes) > MAX_FILE_HASHES:
+            _file_hashes.popitem(last=False)
+
+    return digest.hexdigest()
+
+
+def chunk_hash(doc: Document) -> str:
+    source = (doc.metadata or {}).get("source", "")
+    payload = f"{source}\x00{doc.page_content}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_key(hashes) -> str:
+    """
+    Content address of a store: hash of its (sorted) chunk hashes.
+    Two quizzes covering the same lecture content resolve to the same key.
+    """
+    digest = hashlib.sha256()
+    for h in sorted(hashes):
+        digest.update(h.encode("ascii"))
+    return digest.hexdigest()
+
+
+def lecture_key(kind: str, source: str, source_hash: str) -> str:
+    """
+    Key of a single lecture file's store (pdf or video), bound to its bytes.
+    """
+    payload = f"lecture\x00{kind}\x00{source}\x00{source_hash}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _index_path(key: str) -> Path:
+    return INDEX_DIR / key
+
+
+def _manifest_path(name: str) -> Path:
+    hashed = hashlib.md5(name.encode()).hexdigest()
+    return MANIFEST_DIR / f"{hashed}.json"
+
+
+def save_vector_store(key: str, vector_store):
+    """
+    Persist the raw FAISS index plus a compact JSON docstore.
+    The embeddings client is NOT serialized.
+    """
+    target = _index_path(key)
+    if (target / INDEX_FILE).exists():
+        return
+
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    # unique per call: worker threads of one process may build the same key
+    tmp = INDEX_DIR / f".{key}.{uuid.uuid4().hex}.tmp"
+    tmp.mkdir(parents=True, exist_ok=True)
+
+    faiss.write_index(vector_store.index, str(tmp / INDEX_FILE))
+
+    entries = []
+    for position in range(vector_store.index.ntotal):
+        doc_id = vector_store.index_to_docstore_id[position]
+        doc = vector_store.docstore.search(doc_id)
+        entries.append([doc_id, doc.page_content, doc.metadata or {}])
+
+    with open(tmp / DOCSTORE_FILE, "w", encoding="utf-8") as f:
+        json.dump(entries, f, ensure_ascii=False)
+
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # another worker published the same content key first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_vector_store(key: str, embeddings):
+    """
+    Load a store by content key.
+    The FAISS index is memory-mapped; loaded stores are kept in a small LRU.
+    Concurrent callers asking for the same key wait for a single load.
+    """
+    with _lock:
+        vector_store = _loaded_stores.get(key)
+        if vector_store is not None:
+            _loaded_stores.move_to_end(key)
+            return vector_store
+        key_lock = _loading.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _lock:
+            vector_store = _loaded_stores.get(key)
+            if vector_store is not None:
+                _loaded_stores.move_to_end(key)
+                return vector_store
+
+        vector_store = None
+        try:
+            vector_store = _read_vector_store(key, embeddings)
+        finally:
+            with _lock:
+                # publish before dropping the key lock so no caller loads it twice
+                if vector_store is not None:
+                    _loaded_stores[key] = vector_store
+                    _loaded_stores.move_to_end(key)
+                    while len(_loaded_stores) > MAX_LOADED_STORES:
+                        _loaded_stores.popitem(last=False)
+                _loading.pop(key, None)
+
+    return vector_store
+
+
+def _read_vector_store(key: str, embeddings):
+    path = _index_path(key)
+    if not (path / INDEX_FILE).exists():
+        return None
+
+    index = read_index(path / INDEX_FILE)
+
+    with open(path / DOCSTORE_FILE, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    docstore = InMemoryDocstore({
+        doc_id: Document(page_content=text, metadata=metadata)
+        for doc_id, text, metadata in entries
+    })
+    index_to_docstore_id = {
+        position: entry[0] for position, entry in enumerate(entries)
+    }
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
 
 
-def cache_path(key: str) -> Path:
-    CACHE_DIR.mkdir(exist_ok=True)
-    hashed = hashlib.md5(key.encode()).hexdigest()
-    return CACHE_DIR / f"{hashed}.pkl"
+def load_manifest(name: str):
+    path = _manifest_path(name)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
 
-def save_vector_store(quiz_id, vector_store):
-    with open(cache_path(quiz_id), "wb") as f:
-        pickle.dump(vector_store, f)
+def save_manifest(name: str, key: str, sources: dict):
+    """
+    Map a logical name (quiz/scope/source) to a content key,
+    together with the file hashes it was built from.
+    """
+    MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+    path = _manifest_path(name)
+    tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
 
-def load_vector_store(quiz_id):
-    path = cache_path(quiz_id)
-    if path.exists():
-        with open(path, "rb") as f:
-            return pickle.load(f)
-    return None
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "key": key, "sources": sources}, f)
 
+    os.replace(tmp, path)
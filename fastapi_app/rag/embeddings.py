@@ -1,7 +1,32 @@
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from fastapi_app.rag.cache import chunk_hash
+from fastapi_app.services.model_registry import get_model
+
+
+class SentenceEmbeddings(Embeddings):
+    """
+    LangChain embeddings on top of the shared sentence-transformers model,
+    so MiniLM is loaded once per process (and only when first needed).
+    Produces the same vectors as HuggingFaceEmbeddings with default kwargs.
+    """
+
+    def embed_documents(self, texts):
+        texts = [t.replace("\n", " ") for t in texts]
+        vectors = get_model("sentence_encoder").encode(
+            texts,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
 
 
 def _to_text(item) -> str:
@@ -30,6 +55,13 @@ def _to_text(item) -> str:
     return str(item)
 
 
+_embeddings = SentenceEmbeddings()
+
+
+def get_embeddings():
+    return _embeddings
+
+
 def build_vector_store(documents):
     """
     Build FAISS vector store safely from ANY input.
@@ -39,11 +71,11 @@ def build_vector_store(documents):
     - List[dict]
     """
 
-    embeddings = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    embeddings = get_embeddings()
 
     normalized_docs = []
+    ids = []
+    seen = set()
 
     for item in documents:
         text = _to_text(item)
@@ -56,14 +88,60 @@ def build_vector_store(documents):
         if not text.strip():
             continue 
 
-        normalized_docs.append(
-            Document(page_content=text)
-        )
+        metadata = item.metadata if isinstance(item, Document) else {}
+        doc = Document(page_content=text, metadata=metadata or {})
+
+        doc_id = chunk_hash(doc)
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+
+        normalized_docs.append(doc)
+        ids.append(doc_id)
 
     if not normalized_docs:
         raise ValueError("No valid documents to embed")
 
     return FAISS.from_documents(
         normalized_docs,
-        embedding=embeddings
+        embedding=embeddings,
+        ids=ids
+    )
+
+
+
+def merge_vector_stores(stores, embeddings=None):
+    """
+    Merge already-embedded stores into one FAISS store
+    by copying their vectors; nothing is re-embedded.
+    Chunks present in several stores are kept once.
+    """
+    stores = [vs for vs in stores if vs is not None and vs.index.ntotal]
+    if not stores:
+        return None
+
+    index = faiss.IndexFlatL2(stores[0].index.d)
+    docs = {}
+    index_to_docstore_id = {}
+
+    for vs in stores:
+        vectors = vs.index.reconstruct_n(0, vs.index.ntotal)
+
+        rows = []
+        for position in range(vs.index.ntotal):
+            doc_id = vs.index_to_docstore_id[position]
+            if doc_id in docs:
+                continue
+            docs[doc_id] = vs.docstore.search(doc_id)
+            index_to_docstore_id[len(index_to_docstore_id)] = doc_id
+            rows.append(position)
+
+        if rows:
+            index.add(np.ascontiguousarray(vectors[rows], dtype="float32"))
+
+    return FAISS(
+        embedding_function=embeddings or stores[0].embedding_function,
+        index=index,
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id=index_to_docstore_id,
     )
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 from collections import defaultdict
@@ -9,6 +10,9 @@ from langchain_core.output_parsers import StrOutputParser
 
 from fastapi_app.rag.validator import _normalize, is_valid_mcq
 
+MAX_ATTEMPTS = 4
+DEFAULT_CONCURRENCY = 6
+
 def docs_to_text(docs, max_chars=4000):
     """
     Convert LangChain documents into a single text block.
@@ -66,7 +70,122 @@ def _extract_json(text: str):
         return None
 
 
-def generate_questions(vector_store, num_questions=5):
+def _accept(q, collected, seen):
+    """
+    Add q to collected unless it duplicates (exactly or nearly)
+    a question already collected.
+    """
+    q_text = q["question"].strip()
+    norm_q = _normalize(q_text)
+
+    if norm_q in seen:
+        return False
+
+    if any(
+        similarity(q_text, ex["question"]) > 0.80
+        for ex in collected
+    ):
+        return False
+
+    seen.add(norm_q)
+    collected.append(q)
+    return True
+
+
+def _merge_batch(raw, collected, seen, num_questions, progress):
+    """
+    Merge one LLM response; returns how many questions were accepted.
+    """
+    parsed = _extract_json(raw)
+    if not isinstance(parsed, list):
+        return 0
+
+    accepted = 0
+    for q in parsed:
+        if len(collected) == num_questions:
+            break
+
+        if not is_valid_mcq(q):
+            continue
+
+        if not _accept(q, collected, seen):
+            continue
+
+        accepted += 1
+        if progress:
+            progress("generating", len(collected), num_questions)
+
+    return accepted
+
+
+def _generate_serially(chain, plan, collected, seen, num_questions, progress):
+    for context, need in plan:
+        attempts = 0
+        while need > 0 and attempts < MAX_ATTEMPTS:
+            attempts += 1
+
+            raw = chain.invoke({
+                "context": context,
+                "num": need
+            })
+
+            need -= _merge_batch(raw, collected, seen, num_questions, progress)
+
+            if len(collected) == num_questions:
+                return
+
+
+def _generate_concurrently(
+    chain, plan, collected, seen, num_questions, concurrency, progress
+):
+    """
+    Each round sends one request per source that still needs questions
+    through chain.abatch (at most `concurrency` in flight), then merges the
+    answers in source order so the result does not depend on timing.
+    """
+    needs = [need for _, need in plan]
+
+    async def rounds():
+        for _ in range(MAX_ATTEMPTS):
+            pending = [i for i, need in enumerate(needs) if need > 0]
+            if not pending or len(collected) == num_questions:
+                return
+
+            responses = await chain.abatch(
+                [
+                    {"context": plan[i][0], "num": needs[i]}
+                    for i in pending
+                ],
+                config={"max_concurrency": concurrency},
+                return_exceptions=True,
+            )
+
+            for i, raw in zip(pending, responses):
+                if isinstance(raw, Exception):
+                    print("WARNING → question generation failed:", raw)
+                    continue
+
+                needs[i] -= _merge_batch(
+                    raw, collected, seen, num_questions, progress
+                )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(rounds())
+        return
+
+    # already inside an event loop: fall back to the serial path
+    _generate_serially(chain, plan, collected, seen, num_questions, progress)
+
+
+def generate_questions(
+    vector_store,
+    num_questions=5,
+    progress=None,
+    concurrent=True,
+    concurrency=DEFAULT_CONCURRENCY,
+):
 
     retriever = vector_store.as_retriever(
         search_type="mmr",
@@ -151,47 +270,26 @@ Context:
     collected = []
     seen = set()
 
-    for source, need in zip(sources, distribution):
-        if need <= 0:
-            continue
-
-        context = docs_to_text(source_map[source], max_chars=3500)
-
-        attempts = 0
-        while need > 0 and attempts < 4:
-            attempts += 1
+    if progress:
+        progress("generating", 0, num_questions)
 
-            raw = chain.invoke({
-                "context": context,
-                "num": need
-            })
-
-            parsed = _extract_json(raw)
-            if not isinstance(parsed, list):
-                continue
-
-            for q in parsed:
-                if not is_valid_mcq(q):
-                    continue
-
-                q_text = q["question"].strip()
-                norm_q = _normalize(q_text)
-
-                if norm_q in seen:
-                    continue
-
-                if any(
-                    similarity(q_text, ex["question"]) > 0.80
-                    for ex in collected
-                ):
-                    continue
+    plan = [
+        (docs_to_text(source_map[source], max_chars=3500), need)
+        for source, need in zip(sources, distribution)
+        if need > 0
+    ]
 
-                seen.add(norm_q)
-                collected.append(q)
-                need -= 1
+    if concurrent:
+        _generate_concurrently(
+            chain, plan, collected, seen, num_questions, concurrency, progress
+        )
+    else:
+        _generate_serially(
+            chain, plan, collected, seen, num_questions, progress
+        )
 
-                if len(collected) == num_questions:
-                    return collected
+    if len(collected) >= num_questions:
+        return collected[:num_questions]
 
     remaining = num_questions - len(collected)
     if remaining > 0:
@@ -204,20 +302,11 @@ Context:
 
         parsed = _extract_json(raw) or []
         for q in parsed:
-            q_text = q["question"].strip()
-            norm_q = _normalize(q_text)
-
-            if norm_q in seen:
-                continue
-
-            if any(
-                similarity(q_text, ex["question"]) > 0.80
-                for ex in collected
-            ):
+            if not _accept(q, collected, seen):
                 continue
 
-            collected.append(q)
-            seen.add(norm_q)
+            if progress:
+                progress("generating", len(collected), num_questions)
 
             if len(collected) == num_questions:
                 break
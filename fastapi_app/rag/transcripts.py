@@ -0,0 +1,141 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi_app.rag.cache import CACHE_DIR, file_hash
+from fastapi_app.services.model_registry import WHISPER_MODEL_NAME
+
+TRANSCRIPT_DIR = CACHE_DIR / "transcripts"
+
+# whisper.audio.SAMPLE_RATE; kept here so importing this module stays cheap
+SAMPLE_RATE = 16000
+
+CHUNK_SECONDS = 10 * 60
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+_pool = None
+_worker_model = None
+
+
+def _transcript_path(digest: str) -> Path:
+    # a different Whisper model produces a different transcript
+    return TRANSCRIPT_DIR / f"{digest}.{WHISPER_MODEL_NAME}.json"
+
+
+def load_transcript(video_path: Path):
+    """
+    Cached segments for a video made by the current WHISPER_MODEL_NAME,
+    or None. Each segment is {"start": float, "end": float, "text": str}.
+    """
+    digest = file_hash(video_path)
+    if not digest:
+        return None
+
+    path = _transcript_path(digest)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("model") != WHISPER_MODEL_NAME:
+        return None
+    return data.get("segments")
+
+
+def save_transcript(video_path: Path, segments):
+    digest = file_hash(video_path)
+    if not digest:
+        return
+
+    TRANSCRIPT_DIR.mkdir(parents=True, exist_ok=True)
+    path = _transcript_path(digest)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"model": WHISPER_MODEL_NAME, "segments": segments}, f)
+
+    os.replace(tmp, path)
+
+
+def _segments(result, offset=0.0):
+    segments = []
+    for seg in result.get("segments", []):
+        text = seg.get("text", "").strip()
+        if text:
+            segments.append({
+                "start": round(seg.get("start", 0.0) + offset, 2),
+                "end": round(seg.get("end", 0.0) + offset, 2),
+                "text": text,
+            })
+    return segments
+
+
+def _init_worker(model_name):
+    global _worker_model
+    import whisper
+    _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_chunk(audio, offset):
+    result = _worker_model.transcribe(audio, fp16=False)
+    return _segments(result, offset)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            initializer=_init_worker,
+            initargs=(WHISPER_MODEL_NAME,),
+        )
+    return _pool
+
+
+def transcribe(video_path: Path, model):
+    """
+    Transcribe a video with Whisper.
+    Short videos run on `model` in-process; long ones are cut into
+    CHUNK_SECONDS audio chunks and transcribed across a process pool.
+    """
+    import whisper
+
+    audio = whisper.load_audio(str(video_path))
+    chunk_len = CHUNK_SECONDS * SAMPLE_RATE
+
+    if MAX_WORKERS < 2 or len(audio) <= chunk_len * 1.5:
+        return _segments(model.transcribe(audio, fp16=False))
+
+    offsets = range(0, len(audio), chunk_len)
+    futures = [
+        _get_pool().submit(
+            _transcribe_chunk,
+            audio[start:start + chunk_len],
+            start / SAMPLE_RATE,
+        )
+        for start in offsets
+    ]
+
+    segments = []
+    for future in futures:
+        segments.extend(future.result())
+    return segments
+
+
+def get_transcript(video_path: Path, model):
+    """
+    Cached transcript keyed by the video's content hash and the Whisper
+    model; Whisper only runs for videos the model has never seen.
+    """
+    segments = load_transcript(video_path)
+    if segments is not None:
+        return segments
+
+    segments = transcribe(video_path, model)
+    save_transcript(video_path, segments)
+    return segments
@@ -1,42 +1,130 @@
 from fastapi_app.rag.text_splitter import split_docs
-from fastapi_app.rag.embeddings import build_vector_store
-from fastapi_app.rag.pdf_loader import load_pdfs
-from fastapi_app.rag.video_loader import load_videos
-from fastapi_app.rag.cache import load_vector_store, save_vector_store
+from fastapi_app.rag.embeddings import (
+    build_vector_store,
+    get_embeddings,
+    merge_vector_stores,
+)
+from fastapi_app.rag.pdf_loader import load_pdfs, MEDIA_ROOT as PDF_ROOT
+from fastapi_app.rag.video_loader import load_videos, MEDIA_ROOT as VIDEO_ROOT
+from fastapi_app.rag.cache import (
+    content_key,
+    file_hash,
+    lecture_key,
+    load_manifest,
+    load_vector_store,
+    save_manifest,
+    save_vector_store,
+)
 from fastapi_app.services.quiz_access import (get_quiz_pdfs, get_quiz_videos,)
 
+LOADERS = {
+    "pdf": (load_pdfs, PDF_ROOT),
+    "video": (load_videos, VIDEO_ROOT),
+}
+
+
+def _source_hashes(pdfs, videos):
+    sources = {}
+    for pdf in pdfs:
+        sources[f"pdf:{pdf}"] = file_hash(PDF_ROOT / pdf)
+    for video in videos:
+        sources[f"video:{video}"] = file_hash(VIDEO_ROOT / video)
+    return sources
+
+
+def get_lecture_vector_store(
+    kind: str,
+    path: str,
+    embeddings,
+    source_hash=None,
+    progress=None,
+):
+    """
+    Vector store for ONE lecture file, embedded once per file hash
+    and reused by every quiz that covers the lecture.
+    """
+    loader, media_root = LOADERS[kind]
+    progress = progress or (lambda stage: None)
+
+    source_hash = source_hash or file_hash(media_root / path)
+    key = lecture_key(kind, path, source_hash) if source_hash else None
+
+    if key:
+        vector_store = load_vector_store(key, embeddings)
+        if vector_store:
+            return vector_store
+
+    progress("transcribing" if kind == "video" else "loading")
+    documents = loader([path])
+    if not documents:
+        return None
+
+    chunks = split_docs(documents)
+    progress("embedding")
+    try:
+        vector_store = build_vector_store(chunks)
+    except ValueError:
+        return None
+
+    if key:
+        save_vector_store(key, vector_store)
+
+    return vector_store
+
+
 def get_or_create_vector_store(
     quiz_id: int,
     scope: str,
     source: str,
-    db
+    db,
+    progress=None
 ):
     VALID_SOURCES = {"pdf", "video", "both"}
     if source not in VALID_SOURCES:
         raise ValueError(f"Invalid source: {source}")
 
+    if progress:
+        progress("loading", 0, 0)
+
+    pdfs = get_quiz_pdfs(quiz_id, scope, db) if source in ("pdf", "both") else []
+    videos = get_quiz_videos(quiz_id, scope, db) if source in ("video", "both") else []
+
+    sources = _source_hashes(pdfs, videos)
+    embeddings = get_embeddings()
+
     cache_key = f"quiz:{quiz_id}|scope:{scope}|source:{source}"
-    vector_store = load_vector_store(cache_key)
-    if vector_store:
-        return vector_store
+    manifest = load_manifest(cache_key)
+    if manifest and manifest.get("sources") == sources:
+        vector_store = load_vector_store(manifest["key"], embeddings)
+        if vector_store:
+            return vector_store
 
-    documents = []
+    lectures = [("pdf", p) for p in pdfs] + [("video", v) for v in videos]
+    lecture_stores = []
 
-    if source in ("pdf", "both"):
-        pdfs = get_quiz_pdfs(quiz_id, scope, db)
-        if pdfs:
-            documents.extend(load_pdfs(pdfs))
+    for done, (kind, path) in enumerate(lectures):
+        lecture_progress = None
+        if progress:
+            lecture_progress = (
+                lambda stage, done=done: progress(stage, done, len(lectures))
+            )
 
-    if source in ("video", "both"):
-        videos = get_quiz_videos(quiz_id, scope, db)
-        if videos:
-            documents.extend(load_videos(videos))
+        lecture_stores.append(
+            get_lecture_vector_store(
+                kind,
+                path,
+                embeddings,
+                source_hash=sources.get(f"{kind}:{path}"),
+                progress=lecture_progress,
+            )
+        )
 
-    if not documents:
+    vector_store = merge_vector_stores(lecture_stores, embeddings)
+    if not vector_store:
         return None
 
-    chunks = split_docs(documents)
-    vector_store = build_vector_store(chunks)
+    key = content_key(vector_store.index_to_docstore_id.values())
+    save_vector_store(key, vector_store)
+    save_manifest(cache_key, key, sources)
 
-    save_vector_store(cache_key, vector_store)
-    return vector_store
+    return load_vector_store(key, embeddings) or vector_store
@@ -1,23 +1,24 @@
 import os
-import django
-import whisper
 from pathlib import Path
 from langchain_core.documents import Document
-import os
-from django.conf import settings
 
 os.environ["PATH"] += os.pathsep + r"C:\ffmpeg\bin"
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
-django.setup()
 
-_WHISPER_MODEL = whisper.load_model("tiny")
+# reading settings only needs DJANGO_SETTINGS_MODULE, not django.setup()
+from django.conf import settings
+
+from fastapi_app.rag.transcripts import get_transcript
+from fastapi_app.services.model_registry import get_model
+
+MEDIA_ROOT = Path(settings.MEDIA_ROOT)
 
 
 def transcribe_video(video_path: Path):
     """
-    Transcribe a video file using Whisper.
-    Returns a list of text segments.
+    Transcribe a video file using Whisper (cached per video hash).
+    Returns a list of segments with start/end timestamps.
     """
 
     if not video_path.exists():
@@ -25,44 +26,37 @@ def transcribe_video(video_path: Path):
         return []
 
     try:
-        result = _WHISPER_MODEL.transcribe(str(video_path),fp16=False)
+        return get_transcript(video_path, get_model("whisper"))
 
     except Exception as e:
         print("ERROR → Whisper failed:", e)
         return []   
 
-    segments = []
-
-    for seg in result.get("segments", []):
-        text = seg.get("text", "").strip()
-        if text:
-            segments.append(text)
-
-    return segments
-
 
 def load_videos(videos):
 
     documents = []
 
     for video in videos:
-        video_path = Path(settings.MEDIA_ROOT) / video
+        video_path = MEDIA_ROOT / video
 
         print("DEBUG → video path:", video_path)
 
-        texts = transcribe_video(video_path)
+        segments = transcribe_video(video_path)
 
-        if not texts:
+        if not segments:
             print("WARNING → No transcript for:", video)
             continue
 
-        for text in texts:
+        for seg in segments:
             documents.append(
                 Document(
-                    page_content=text,
+                    page_content=seg["text"],
                     metadata={
                         "source": video,
                         "source_type": "video",
+                        "start": seg["start"],
+                        "end": seg["end"],
                     }
                 )
             )
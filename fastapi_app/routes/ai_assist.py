@@ -1,6 +1,10 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from fastapi_app.services.rag_agent import ClassifierAgent
+from fastapi_app.services.answer_cache import get_answer_cache
+from fastapi_app.services.ask_batcher import batcher_stats, search_dataset
+from fastapi_app.services.model_registry import get_model, register_model
+
+MAX_BATCH_QUESTIONS = 100
 
 router = APIRouter(prefix="/ai", tags=["AI Assist"])
 
@@ -12,13 +16,52 @@ class AskResponse(BaseModel):
     category: str
     context_used: bool
 
-agent = ClassifierAgent()
+class AskBatchRequest(BaseModel):
+    questions: list[str]
+
+class AskBatchResponse(BaseModel):
+    answers: list[AskResponse]
+
+def _load_agent():
+    from fastapi_app.services.rag_agent import ClassifierAgent
+    return ClassifierAgent()
+
+
+register_model("classifier_agent", _load_agent)
 
 @router.post("/ask", response_model=AskResponse)
 def ask_ai(request: AskRequest):
-    answer, category, context_used = agent(request.question)
+    agent = get_model("classifier_agent")
+
+    # dataset lookup is micro-batched with concurrent requests
+    answer, query_vec = search_dataset(request.question)
+    if answer:
+        return AskResponse(answer=answer, category="Dataset", context_used=True)
+
     return AskResponse(
-        answer=answer,
-        category=category,
-        context_used=context_used
+        answer=agent.general_agent(request.question, query_vec=query_vec),
+        category="General",
+        context_used=False
     )
+
+@router.post("/ask/batch", response_model=AskBatchResponse)
+def ask_ai_batch(request: AskBatchRequest):
+    if len(request.questions) > MAX_BATCH_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_QUESTIONS} questions per batch"
+        )
+
+    agent = get_model("classifier_agent")
+    results = agent.answer_many(request.questions)
+    return AskBatchResponse(answers=[
+        AskResponse(answer=answer, category=category, context_used=context_used)
+        for answer, category, context_used in results
+    ])
+
+@router.get("/ask/stats")
+def ask_stats():
+    return {
+        "batcher": batcher_stats(),
+        "answer_cache": get_answer_cache().stats(),
+    }
@@ -1,14 +1,31 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from fastapi_app.dependencies import get_db
 from fastapi_app.rag.validator import validate_answer
 from fastapi_app.rag.vector_store import get_or_create_vector_store
-from fastapi_app.rag.question_generator import generate_questions
+from fastapi_app.services.quiz_jobs import generate_quiz_payload, get_job, submit_job
 from fastapi import Body
 
 
 router = APIRouter(prefix="/quiz", tags=["Quiz RAG"])
+
+JOB_EVENT_INTERVAL = 0.5
+
+
+def _num_questions(payload: dict) -> int:
+    try:
+        num_questions = int(payload.get("num_questions", 5))
+    except (TypeError, ValueError):
+        num_questions = 5
+
+    return max(1, min(num_questions, 50))
+
+
 @router.post("/{quiz_id}/generate")
 def generate_quiz(
     quiz_id: int,
@@ -26,51 +43,73 @@ def generate_quiz(
             "questions": [],
         }
 
-    try:
-        num_questions = int(payload.get("num_questions", 5))
-    except (TypeError, ValueError):
-        num_questions = 5
+    return generate_quiz_payload(
+        quiz_id,
+        scope,
+        source,
+        _num_questions(payload),
+        db,
+    )
 
-    num_questions = max(1, min(num_questions, 50))
 
-    vector_store = get_or_create_vector_store(
-        quiz_id=quiz_id,
-        scope=scope,
-        source=source, 
-        db=db,
+@router.post("/{quiz_id}/generate/jobs", status_code=202)
+def submit_generation_job(
+    quiz_id: int,
+    scope: str = Query("all_before"),
+    source: str = "both",
+    payload: dict = Body(default={}),
+):
+    job = submit_job(
+        quiz_id,
+        scope,
+        source,
+        _num_questions(payload),
     )
+    return job.to_dict()
 
-    if not vector_store:
-        return {
-            "quiz_id": quiz_id,
-            "mode": "auto",
-            "scope": scope,
-            "questions": [],
-            "warning": "No lecture content available",
-        }
 
-    questions = generate_questions(
-        vector_store,
-        num_questions=num_questions,
-    )
-    print("🧠 Generating", num_questions, "questions")
+def _get_job_or_404(job_id: str):
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
-    if not questions:
-        return {
-            "quiz_id": quiz_id,
-            "mode": "auto",
-            "scope": scope,
-            "questions": [],
-            "warning": "AI could not generate valid questions",
-        }
 
-    return {
-        "quiz_id": quiz_id,
-        "mode": "auto",
-        "scope": scope,
-        "num_questions": num_questions,
-        "questions": questions,
-    }
+@router.get("/jobs/{job_id}")
+def generation_job_status(job_id: str):
+    return _get_job_or_404(job_id).to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+def generation_job_result(job_id: str):
+    job = _get_job_or_404(job_id)
+
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+
+    if not job.finished:
+        return JSONResponse(status_code=202, content=job.to_dict())
+
+    return job.result
+
+
+@router.get("/jobs/{job_id}/events")
+async def generation_job_events(job_id: str):
+    job = _get_job_or_404(job_id)
+
+    async def stream():
+        version = -1
+        while True:
+            if job.version != version:
+                version = job.version
+                yield f"data: {json.dumps(job.to_dict())}\n\n"
+
+            if job.finished:
+                break
+
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
 
 @router.post("/{quiz_id}/validate-answer")
 def validate_quiz_answer(
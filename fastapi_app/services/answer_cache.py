@@ -0,0 +1,171 @@
+"""
+Semantic cache of GeneralAgent answers.
+
+Answers are stored in rag_cache/answers.sqlite3 with the normalized query
+embedding; a new question whose embedding is within SIMILARITY_THRESHOLD
+(cosine) of a cached one is answered from the cache instead of the LLM.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from fastapi_app.rag.cache import CACHE_DIR
+
+ANSWER_DB = CACHE_DIR / "answers.sqlite3"
+
+SIMILARITY_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.90"))
+TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_HOURS", "168")) * 3600
+MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+
+
+def normalize(vector):
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticAnswerCache:
+
+    def __init__(self, path=ANSWER_DB, threshold=SIMILARITY_THRESHOLD,
+                 ttl=TTL_SECONDS, max_entries=MAX_ENTRIES):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " question TEXT NOT NULL,"
+            " answer TEXT NOT NULL,"
+            " embedding BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_hit REAL NOT NULL,"
+            " hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - ttl,))
+        self._db.commit()
+
+        rows = self._db.execute(
+            "SELECT id, answer, embedding, created_at, last_hit FROM answers ORDER BY id"
+        ).fetchall()
+
+        self._ids = [r[0] for r in rows]
+        self._answers = [r[1] for r in rows]
+        self._created = [r[3] for r in rows]
+        self._last_hit = [r[4] for r in rows]
+        self._vectors = (
+            np.vstack([np.frombuffer(r[2], dtype=np.float32) for r in rows])
+            if rows else None
+        )
+
+        print(f"✅ Answer cache loaded: {len(self._ids)} entries")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _remove(self, positions):
+        positions = sorted(positions, reverse=True)
+        self._db.executemany(
+            "DELETE FROM answers WHERE id = ?", [(self._ids[p],) for p in positions]
+        )
+        for column in (self._ids, self._answers, self._created, self._last_hit):
+            for position in positions:
+                del column[position]
+        self._vectors = np.delete(self._vectors, positions, axis=0) if self._ids else None
+
+    def lookup(self, vector):
+        """
+        Cached answer for the closest stored question that has not
+        expired, or None. Expired entries are dropped on the way.
+        """
+        vector = normalize(vector)
+        now = time.time()
+
+        with self._lock:
+            if self._vectors is not None:
+                expired = np.flatnonzero(now - np.asarray(self._created) > self.ttl)
+                if len(expired):
+                    self._remove(expired.tolist())
+                    self._db.commit()
+                    self._metrics["expired"] += len(expired)
+
+            if self._vectors is None:
+                self._metrics["misses"] += 1
+                return None
+
+            similarities = self._vectors @ vector
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.threshold:
+                self._metrics["misses"] += 1
+                return None
+
+            self._last_hit[best] = now
+            self._db.execute(
+                "UPDATE answers SET last_hit = ?, hits = hits + 1 WHERE id = ?",
+                (now, self._ids[best])
+            )
+            self._db.commit()
+            self._metrics["hits"] += 1
+            return self._answers[best]
+
+    def store(self, question, answer, vector):
+        if not answer:
+            return
+
+        vector = normalize(vector)
+        now = time.time()
+
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO answers (question, answer, embedding, created_at, last_hit)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (question, answer, vector.tobytes(), now, now)
+            )
+
+            self._ids.append(cursor.lastrowid)
+            self._answers.append(answer)
+            self._created.append(now)
+            self._last_hit.append(now)
+            self._vectors = (
+                vector[None, :] if self._vectors is None
+                else np.vstack([self._vectors, vector])
+            )
+
+            # least recently used entries go first
+            while len(self._ids) > self.max_entries:
+                self._remove([int(np.argmin(self._last_hit))])
+                self._metrics["evictions"] += 1
+
+            self._db.commit()
+            self._metrics["stores"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["entries"] = len(self._ids)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticAnswerCache()
+    return _cache
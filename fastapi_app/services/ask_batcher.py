@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from fastapi_app.services.model_registry import get_model
+
+# how long the first question of a batch waits for company
+BATCH_WINDOW_SECONDS = 0.005
+MAX_BATCH_SIZE = 64
+# a caller stops waiting after this long and gets no dataset answer
+SEARCH_TIMEOUT_SECONDS = 30
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+_stats = {"batches": 0, "questions": 0, "largest_batch": 0}
+
+
+def _collect():
+    batch = [_queue.get()]
+    deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+
+    while len(batch) < MAX_BATCH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=remaining))
+        except queue.Empty:
+            break
+
+    return batch
+
+
+def _run():
+    while True:
+        batch = _collect()
+        questions = [question for question, _ in batch]
+
+        try:
+            agent = get_model("classifier_agent")
+            answers, vectors = agent.course_agent.search_with_vectors(questions)
+            if len(answers) != len(batch) or len(vectors) != len(batch):
+                raise RuntimeError(
+                    f"search_with_vectors returned {len(answers)} answers for {len(batch)} questions"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        _stats["batches"] += 1
+        _stats["questions"] += len(batch)
+        _stats["largest_batch"] = max(_stats["largest_batch"], len(batch))
+
+        for (_, future), answer, vector in zip(batch, answers, vectors):
+            if not future.done():
+                future.set_result((answer, vector))
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, name="ask-batcher", daemon=True)
+            _worker.start()
+
+
+def search_dataset(question: str):
+    """
+    (dataset answer or None, query embedding or None) for one question.
+    Questions arriving within BATCH_WINDOW_SECONDS of each other share
+    one encoder pass and one FAISS search.
+    """
+    _ensure_worker()
+    future = Future()
+    _queue.put((question, future))
+    try:
+        return future.result(timeout=SEARCH_TIMEOUT_SECONDS)
+    except TimeoutError:
+        print("⚠️ Dataset search timed out after", SEARCH_TIMEOUT_SECONDS, "s")
+        return None, None
+
+
+def batcher_stats():
+    stats = dict(_stats)
+    stats["avg_batch"] = round(stats["questions"] / stats["batches"], 2) if stats["batches"] else 0
+    return stats
@@ -0,0 +1,222 @@
+"""
+Precomputed knowledge-base artifact for CourseAgent.
+
+    python -m fastapi_app.services.kb_index [path/to/dataset.xlsx]
+
+builds rag_cache/kb/<spreadsheet sha256>/ once; workers memory-map it.
+"""
+import json
+import math
+import os
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from fastapi_app.rag.cache import CACHE_DIR, file_hash, read_index
+from fastapi_app.services.model_registry import SENTENCE_ENCODER_NAME, get_model
+
+KB_DIR = CACHE_DIR / "kb"
+
+# rank_bm25.BM25Okapi defaults
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_EPSILON = 0.25
+
+
+def tokenize(text: str):
+    return text.lower().split()
+
+
+def normalize_question(text: str):
+    return text.strip().lower()
+
+
+class KnowledgeBaseIndex:
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        with open(path / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        with open(path / "rows.json", encoding="utf-8") as f:
+            rows = json.load(f)
+
+        self.questions = [q for q, _ in rows]
+        self.answers = [a for _, a in rows]
+
+        # normalized question -> first row, for O(1) exact matches
+        self.exact = {}
+        for i, q in enumerate(self.questions):
+            self.exact.setdefault(normalize_question(q), i)
+
+        self.index = read_index(path / "index.faiss")
+        self.embeddings = np.load(path / "embeddings.npy", mmap_mode="r")
+
+        with open(path / "vocab.json", encoding="utf-8") as f:
+            self.vocab = json.load(f)
+
+        self.idf = np.load(path / "idf.npy", mmap_mode="r")
+        self.doc_len = np.load(path / "doc_len.npy", mmap_mode="r")
+        self.postings_indptr = np.load(path / "postings_indptr.npy", mmap_mode="r")
+        self.postings_docs = np.load(path / "postings_docs.npy", mmap_mode="r")
+        self.postings_tf = np.load(path / "postings_tf.npy", mmap_mode="r")
+        self.avgdl = self.meta["avgdl"]
+
+    def __len__(self):
+        return len(self.answers)
+
+    def exact_match(self, query: str):
+        return self.exact.get(normalize_question(query))
+
+    def bm25_scores(self, tokens):
+        """
+        Sparse BM25Okapi scores: only rows containing a query term are touched.
+        Returns (rows, scores), rows sorted ascending; every other row scores 0.
+        """
+        docs, contributions = [], []
+
+        for token in tokens:
+            term_id = self.vocab.get(token)
+            if term_id is None:
+                continue
+
+            start = self.postings_indptr[term_id]
+            end = self.postings_indptr[term_id + 1]
+            term_docs = self.postings_docs[start:end]
+            tf = self.postings_tf[start:end]
+
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[term_docs] / self.avgdl)
+            docs.append(term_docs)
+            contributions.append(self.idf[term_id] * (tf * (BM25_K1 + 1)) / (tf + norm))
+
+        if not docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        rows, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(contributions))
+        return rows, scores
+
+
+def _artifact_path(source_hash: str) -> Path:
+    return KB_DIR / source_hash
+
+
+def build_kb_index(dataset_path, source_hash=None) -> Path:
+    """
+    Read the spreadsheet once and write embeddings, the FAISS index,
+    BM25 statistics and the answers to rag_cache/kb/<hash>/.
+    """
+    import pandas as pd
+
+    dataset_path = Path(dataset_path)
+    source_hash = source_hash or file_hash(dataset_path)
+    target = _artifact_path(source_hash)
+
+    df = pd.read_excel(dataset_path)
+    df = df.dropna(subset=["Question", "Answer"])
+
+    questions = df["Question"].astype(str).tolist()
+    answers = df["Answer"].astype(str).tolist()
+    combined = [f"{q} {a}" for q, a in zip(questions, answers)]
+
+    embeddings = get_model("sentence_encoder").encode(
+        combined,
+        convert_to_numpy=True,
+        show_progress_bar=True
+    ).astype("float32")
+    faiss.normalize_L2(embeddings)
+
+    index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+
+    vocab = {}
+    postings = []
+    doc_len = np.zeros(len(combined), dtype=np.float32)
+
+    for doc_id, doc in enumerate(combined):
+        tokens = tokenize(doc)
+        doc_len[doc_id] = len(tokens)
+        for token, tf in Counter(tokens).items():
+            term_id = vocab.setdefault(token, len(vocab))
+            if term_id == len(postings):
+                postings.append([])
+            postings[term_id].append((doc_id, tf))
+
+    corpus_size = len(combined)
+    avgdl = float(doc_len.mean()) if corpus_size else 0.0
+
+    idf = np.array([
+        math.log(corpus_size - len(p) + 0.5) - math.log(len(p) + 0.5)
+        for p in postings
+    ], dtype=np.float64)
+    if len(idf):
+        idf[idf < 0] = BM25_EPSILON * float(idf.mean())
+
+    indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(p) for p in postings])
+    postings_docs = np.array([d for p in postings for d, _ in p], dtype=np.int64)
+    postings_tf = np.array([tf for p in postings for _, tf in p], dtype=np.float32)
+
+    KB_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = KB_DIR / f".{source_hash}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    with open(tmp / "rows.json", "w", encoding="utf-8") as f:
+        json.dump(list(zip(questions, answers)), f, ensure_ascii=False)
+
+    with open(tmp / "vocab.json", "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+
+    np.save(tmp / "embeddings.npy", embeddings)
+    np.save(tmp / "idf.npy", idf)
+    np.save(tmp / "doc_len.npy", doc_len)
+    np.save(tmp / "postings_indptr.npy", indptr)
+    np.save(tmp / "postings_docs.npy", postings_docs)
+    np.save(tmp / "postings_tf.npy", postings_tf)
+    faiss.write_index(index, str(tmp / "index.faiss"))
+
+    with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "source": str(dataset_path),
+            "source_hash": source_hash,
+            "model": SENTENCE_ENCODER_NAME,
+            "rows": corpus_size,
+            "avgdl": avgdl,
+        }, f)
+
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return target
+
+
+def load_kb_index(dataset_path):
+    """
+    Memory-map the artifact for the spreadsheet's current contents,
+    building it first only if that version was never built.
+    Returns None when the spreadsheet does not exist.
+    """
+    source_hash = file_hash(dataset_path)
+    if not source_hash:
+        return None
+
+    path = _artifact_path(source_hash)
+    if not (path / "meta.json").exists():
+        print(f"🔧 Building KB index for {dataset_path}")
+        path = build_kb_index(dataset_path, source_hash)
+
+    return KnowledgeBaseIndex(path)
+
+
+if __name__ == "__main__":
+    from fastapi_app.services.rag_agent import DATASET_PATH
+
+    print(build_kb_index(sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH))
@@ -0,0 +1,89 @@
+import threading
+import time
+
+SENTENCE_ENCODER_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+WHISPER_MODEL_NAME = "tiny"
+
+_loaders = {}
+_models = {}
+_load_seconds = {}
+_locks = {}
+_lock = threading.Lock()
+
+
+def register_model(name: str, loader):
+    """
+    Register a zero-argument loader. Nothing is loaded until get_model(name).
+    """
+    _loaders[name] = loader
+
+
+def get_model(name: str):
+    """
+    Process-wide shared instance, loaded on first use (thread-safe).
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    if name not in _loaders:
+        raise KeyError(f"Unknown model: {name}")
+
+    with _lock:
+        lock = _locks.setdefault(name, threading.Lock())
+
+    with lock:
+        if name in _models:
+            return _models[name]
+
+        started = time.perf_counter()
+        model = _loaders[name]()
+        _load_seconds[name] = round(time.perf_counter() - started, 3)
+        _models[name] = model
+
+    print(f"✅ Model '{name}' loaded in {_load_seconds[name]:.2f}s")
+    return model
+
+
+def warm_models(names=None, background=False):
+    """
+    Load models ahead of the first request.
+    With background=True the loading happens in a daemon thread.
+    """
+    names = [n for n in (names or list(_loaders)) if n]
+
+    def _warm():
+        for name in names:
+            try:
+                get_model(name)
+            except Exception as e:
+                print(f"⚠️ Could not warm model '{name}':", e)
+
+    if background:
+        threading.Thread(target=_warm, name="model-warmup", daemon=True).start()
+    else:
+        _warm()
+
+
+def model_stats():
+    return {
+        name: {
+            "loaded": name in _models,
+            "load_seconds": _load_seconds.get(name),
+        }
+        for name in _loaders
+    }
+
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SENTENCE_ENCODER_NAME)
+
+
+def _load_whisper():
+    import whisper
+    return whisper.load_model(WHISPER_MODEL_NAME)
+
+
+register_model("sentence_encoder", _load_sentence_encoder)
+register_model("whisper", _load_whisper)
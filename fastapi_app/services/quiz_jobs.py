@@ -0,0 +1,190 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi_app.database import SessionLocal
+from fastapi_app.rag.vector_store import get_or_create_vector_store
+from fastapi_app.rag.question_generator import generate_questions
+
+MAX_WORKERS = 2
+JOB_TTL_SECONDS = 60 * 60
+
+_executor = ThreadPoolExecutor(
+    max_workers=MAX_WORKERS,
+    thread_name_prefix="quiz-gen"
+)
+_jobs = {}
+_active = {}
+_lock = threading.Lock()
+
+
+class QuizGenerationJob:
+
+    def __init__(self, quiz_id, scope, source, num_questions):
+        self.id = uuid.uuid4().hex
+        self.quiz_id = quiz_id
+        self.scope = scope
+        self.source = source
+        self.num_questions = num_questions
+
+        self.status = "queued"
+        self.stage = "queued"
+        self.current = 0
+        self.total = 0
+        self.version = 0
+
+        self.result = None
+        self.error = None
+
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def key(self):
+        return (self.quiz_id, self.scope, self.source, self.num_questions)
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed")
+
+    def report(self, stage, current=0, total=0):
+        self.stage = stage
+        self.current = current
+        self.total = total
+        self.version += 1
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "quiz_id": self.quiz_id,
+            "scope": self.scope,
+            "source": self.source,
+            "num_questions": self.num_questions,
+            "status": self.status,
+            "stage": self.stage,
+            "current": self.current,
+            "total": self.total,
+            "error": self.error,
+        }
+
+
+def generate_quiz_payload(quiz_id, scope, source, num_questions, db, progress=None):
+    """
+    Build the /generate response body.
+    Shared by the synchronous endpoint and background jobs.
+    """
+    vector_store = get_or_create_vector_store(
+        quiz_id=quiz_id,
+        scope=scope,
+        source=source,
+        db=db,
+        progress=progress,
+    )
+
+    if not vector_store:
+        return {
+            "quiz_id": quiz_id,
+            "mode": "auto",
+            "scope": scope,
+            "questions": [],
+            "warning": "No lecture content available",
+        }
+
+    print("🧠 Generating", num_questions, "questions")
+    questions = generate_questions(
+        vector_store,
+        num_questions=num_questions,
+        progress=progress,
+    )
+
+    if not questions:
+        return {
+            "quiz_id": quiz_id,
+            "mode": "auto",
+            "scope": scope,
+            "questions": [],
+            "warning": "AI could not generate valid questions",
+        }
+
+    return {
+        "quiz_id": quiz_id,
+        "mode": "auto",
+        "scope": scope,
+        "num_questions": num_questions,
+        "questions": questions,
+    }
+
+
+def _finish(job, status):
+    # finished_at first: a job that looks finished always has a timestamp
+    job.finished_at = time.time()
+    job.status = status
+
+
+def _run(job):
+    job.status = "running"
+    job.report("loading")
+
+    db = SessionLocal()
+    try:
+        job.result = generate_quiz_payload(
+            job.quiz_id,
+            job.scope,
+            job.source,
+            job.num_questions,
+            db,
+            progress=job.report,
+        )
+        _finish(job, "done")
+        job.report("done", job.num_questions, job.num_questions)
+
+    except Exception as e:
+        print("ERROR → quiz generation job failed:", e)
+        job.error = str(getattr(e, "detail", e))
+        _finish(job, "failed")
+        job.report("failed")
+
+    finally:
+        db.close()
+        with _lock:
+            if _active.get(job.key) is job:
+                del _active[job.key]
+
+
+def _purge_expired():
+    """
+    Drop jobs that finished more than JOB_TTL_SECONDS ago. Call with _lock held.
+    """
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for job_id in [
+        job_id for job_id, job in _jobs.items()
+        if job.finished and job.finished_at is not None and job.finished_at < cutoff
+    ]:
+        del _jobs[job_id]
+
+
+def submit_job(quiz_id, scope, source, num_questions):
+    """
+    Queue a generation job.
+    An identical job that is still queued or running is returned instead.
+    """
+    job = QuizGenerationJob(quiz_id, scope, source, num_questions)
+
+    with _lock:
+        _purge_expired()
+
+        existing = _active.get(job.key)
+        if existing:
+            return existing
+
+        _jobs[job.id] = job
+        _active[job.key] = job
+
+    _executor.submit(_run, job)
+    return job
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
@@ -1,13 +1,16 @@
 
 from typing_extensions import Literal
 import os
+import threading
 import faiss
 import numpy as np
-import pandas as pd
 import dspy
-from functools import lru_cache
-from sentence_transformers import SentenceTransformer
-from rank_bm25 import BM25Okapi
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi_app.services.answer_cache import get_answer_cache
+from fastapi_app.services.kb_index import load_kb_index, tokenize
+from fastapi_app.services.model_registry import get_model
 
 
 dspy.settings.configure(
@@ -23,11 +26,13 @@ dspy.settings.configure(
 print("✅ OpenAI LLM configured: gpt-5-nano")
 
 DATASET_PATH = "media/Q_A/E-learning_Dataset.xlsx"
-EMBEDDING_MODEL = "all-MiniLM-L6-v2"
 
 TOP_K = 5
 SIM_THRESHOLD = 0.40
 
+MAX_CACHED_ANSWERS = 256
+GENERAL_CONCURRENCY = 8
+
 class AnswerSignature(dspy.Signature):
     context = dspy.InputField()
     question = dspy.InputField()
@@ -37,109 +42,120 @@ class CourseAgent(dspy.Module):
 
     def __init__(self):
         super().__init__()
+        self._answers = OrderedDict()
+        self._answers_lock = threading.Lock()
         self._load_knowledge_base()
 
     def _load_knowledge_base(self):
 
         print(f"📄 Loading KB: {DATASET_PATH}")
 
-        if not os.path.exists(DATASET_PATH):
-            print("⚠️ KB not found")
-            self.df = pd.DataFrame()
-            return
-
-        self.df = pd.read_excel(DATASET_PATH)
-        self.df = self.df.dropna(subset=["Question", "Answer"])
-
-        self.df["Question"] = self.df["Question"].astype(str)
-        self.df["Answer"] = self.df["Answer"].astype(str)
-
-        self.df["combined"] = (
-            self.df["Question"] + " " + self.df["Answer"]
-        )
-
-        self.encoder = SentenceTransformer(EMBEDDING_MODEL)
-
-        embeddings = self.encoder.encode(
-            self.df["combined"].tolist(),
-            convert_to_numpy=True,
-            show_progress_bar=True
-        )
-
-        faiss.normalize_L2(embeddings)
-
-        dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(embeddings)
+        self.kb = load_kb_index(DATASET_PATH)
 
-        self.embeddings = embeddings
-
-        tokenized_corpus = [
-            doc.lower().split()
-            for doc in self.df["combined"]
-        ]
-        self.bm25 = BM25Okapi(tokenized_corpus)
+        if self.kb is None:
+            print("⚠️ KB not found")
 
 
-    @lru_cache(maxsize=256)
     def _search_dataset(self, query: str):
-
-        if self.df.empty:
+        return self.search_many([query])[0]
+
+    def search_many(self, queries):
+        """
+        Dataset answers (or None) for several queries at once:
+        one encoder pass and one FAISS search for every uncached query.
+        """
+        return self.search_with_vectors(queries)[0]
+
+    def search_with_vectors(self, queries):
+        """
+        (answers, vectors): search_many() plus the normalized query
+        embedding of every query that was encoded (None for exact matches),
+        so a general answer can reuse it for the answer cache.
+        """
+        results = [None] * len(queries)
+        vectors = [None] * len(queries)
+
+        if self.kb is None or not len(self.kb):
+            return results, vectors
+
+        pending = {}
+        for i, query in enumerate(queries):
+            with self._answers_lock:
+                if query in self._answers:
+                    self._answers.move_to_end(query)
+                    results[i], vectors[i] = self._answers[query]
+                    continue
+
+            exact = self.kb.exact_match(query)
+            if exact is not None:
+                results[i] = self.kb.answers[exact]
+            else:
+                pending.setdefault(query, []).append(i)
+
+        if pending:
+            unique = list(pending)
+
+            query_vecs = get_model("sentence_encoder").encode(
+                unique,
+                convert_to_numpy=True
+            )
+
+            faiss.normalize_L2(query_vecs)
+
+            similarities, indices = self.kb.index.search(query_vecs, TOP_K)
+
+            for row, query in enumerate(unique):
+                answer = self._rank(query, similarities[row], indices[row])
+                for i in pending[query]:
+                    results[i] = answer
+                    vectors[i] = query_vecs[row]
+
+        with self._answers_lock:
+            for query, answer, vector in zip(queries, results, vectors):
+                self._answers[query] = (answer, vector)
+                self._answers.move_to_end(query)
+            while len(self._answers) > MAX_CACHED_ANSWERS:
+                self._answers.popitem(last=False)
+
+        return results, vectors
+
+    def _rank(self, query, similarities, indices):
+
+        found = indices >= 0
+        semantic_indices = indices[found].astype(np.int64)
+        semantic_scores = similarities[found]
+
+        bm25_rows, bm25_scores = self.kb.bm25_scores(tokenize(query))
+
+        keyword_indices = bm25_rows
+        if len(bm25_rows) > TOP_K:
+            keyword_indices = bm25_rows[
+                np.argpartition(bm25_scores, -TOP_K)[-TOP_K:]
+            ]
+
+        candidates = np.union1d(semantic_indices, keyword_indices)
+
+        if not len(candidates):
             return None
 
-        query_clean = query.strip().lower()
-
-        exact = self.df[
-            self.df["Question"].str.lower().str.strip() == query_clean
-        ]
-        if not exact.empty:
-            return exact.iloc[0]["Answer"]
-
-        query_vec = self.encoder.encode(
-            [query],
-            convert_to_numpy=True
-        )
+        sem = np.zeros(len(candidates))
+        sem[np.searchsorted(candidates, semantic_indices)] = semantic_scores
 
-        faiss.normalize_L2(query_vec)
+        # bm25_rows is sorted, so candidate lookups are a binary search
+        bm = np.zeros(len(candidates))
+        if len(bm25_rows):
+            pos = np.minimum(np.searchsorted(bm25_rows, candidates), len(bm25_rows) - 1)
+            hit = bm25_rows[pos] == candidates
+            bm[hit] = bm25_scores[pos[hit]]
 
-        similarities, indices = self.index.search(query_vec, TOP_K)
+        max_bm25 = max(bm25_scores.max(initial=0.0), 0.0) + 1e-6
 
-        semantic_scores = similarities[0]
-        semantic_indices = indices[0]
+        final_scores = (0.7 * sem) + (0.3 * bm / max_bm25)
 
-        tokenized_query = query.lower().split()
-        bm25_scores = self.bm25.get_scores(tokenized_query)
+        best = int(np.argmax(final_scores))
 
-        keyword_indices = np.argsort(bm25_scores)[::-1][:TOP_K]
-
-        candidate_indices = list(set(semantic_indices) | set(keyword_indices))
-
-        ranked = []
-        max_bm25 = max(bm25_scores) + 1e-6
-
-        for idx in candidate_indices:
-
-            sem_score = 0
-            if idx in semantic_indices:
-                sem_score = semantic_scores[
-                    list(semantic_indices).index(idx)
-                ]
-
-            bm_score = bm25_scores[idx] / max_bm25
-
-            final_score = (0.7 * sem_score) + (0.3 * bm_score)
-
-            ranked.append((idx, final_score))
-
-        ranked.sort(key=lambda x: x[1], reverse=True)
-
-        if not ranked:
-            return None
-
-        best_idx, best_score = ranked[0]
-
-        if best_score >= SIM_THRESHOLD:
-            return self.df.iloc[best_idx]["Answer"]
+        if final_scores[best] >= SIM_THRESHOLD:
+            return self.kb.answers[int(candidates[best])]
 
         return None
 
@@ -160,7 +176,19 @@ class GeneralAgent(dspy.Module):
         super().__init__()
         self.prog = dspy.Predict(AnswerSignature)
 
-    def forward(self, question: str):
+    def forward(self, question: str, query_vec=None):
+
+        # callers coming from the dataset search pass its embedding along
+        if query_vec is None:
+            query_vec = get_model("sentence_encoder").encode(
+                [question],
+                convert_to_numpy=True
+            )[0]
+
+        cache = get_answer_cache()
+        cached = cache.lookup(query_vec)
+        if cached:
+            return cached
 
         context = """
 You are a helpful assistant for an e-learning platform.
@@ -173,6 +201,7 @@ Provide only 4-5 steps which are important.
             context=context,
             question=question
         )
+        cache.store(question, result.answer, query_vec)
         return result.answer
 
 
@@ -185,10 +214,36 @@ class ClassifierAgent(dspy.Module):
 
     def forward(self, question: str):
 
-        dataset_answer, found = self.course_agent(question)
-
-        if found:
-            return dataset_answer, "Dataset", True
-
-        general_answer = self.general_agent(question)
-        return general_answer, "General", False
\ No newline at end of file
+        answers, vectors = self.course_agent.search_with_vectors([question])
+
+        if answers[0]:
+            return answers[0], "Dataset", True
+
+        general_answer = self.general_agent(question, query_vec=vectors[0])
+        return general_answer, "General", False
+
+    def answer_many(self, questions):
+        """
+        Batch version of forward(): dataset lookups share one encoder pass,
+        general answers are requested concurrently.
+        """
+        dataset_answers, vectors = self.course_agent.search_with_vectors(questions)
+        results = [None] * len(questions)
+
+        misses = []
+        for i, answer in enumerate(dataset_answers):
+            if answer:
+                results[i] = (answer, "Dataset", True)
+            else:
+                misses.append(i)
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(GENERAL_CONCURRENCY, len(misses))) as pool:
+                answers = pool.map(
+                    lambda i: self.general_agent(questions[i], query_vec=vectors[i]),
+                    misses
+                )
+                for i, answer in zip(misses, answers):
+                    results[i] = (answer, "General", False)
+
+        return results
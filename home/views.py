@@ -1,9 +1,46 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.shortcuts import redirect, render
-from django.db.models import Count
+from django.utils.cache import patch_cache_control
+
 from courses.models import Course
+from courses.services.landing import (
+    LANDING_TTL,
+    approved_courses,
+    get_landing_aggregates,
+    landing_version,
+)
+
+COURSES_PER_PAGE = 12
+
+# browsers/proxies may reuse the anonymous page for this long
+PUBLIC_MAX_AGE = 300
+
+# anonymous pages past this page number are rendered, not cached
+MAX_CACHED_PAGE = 50
+
+CATEGORIES = {value for value, _ in Course.CATEGORY_CHOICES}
+
+
+def _landing_page_key(request):
+    """
+    Cache key of the anonymous landing page, built from the parameters the
+    page reads (category, page). None when the query string carries anything
+    else, so arbitrary URLs cannot fill the cache.
+    """
+    if set(request.GET) - {"category", "page"}:
+        return None
+
+    category = request.GET.get("category") or ""
+    if category and category not in CATEGORIES:
+        return None
+
+    page = request.GET.get("page") or "1"
+    if not page.isdigit() or not 1 <= int(page) <= MAX_CACHED_PAGE:
+        return None
+
+    return f"landing_page:{landing_version()}:{category}:{int(page)}"
 
-from django.db.models import Count
-from django.shortcuts import redirect, render
 
 def smart_home(request):
 
@@ -17,36 +54,36 @@ def smart_home(request):
         if dashboard:
             return redirect(dashboard)
 
-    selected_category = request.GET.get("category")
-
-    approved_courses = Course.objects.filter(
-        status="approved",
-        is_published=True
-    )
+    anonymous = not request.user.is_authenticated
+    page_key = _landing_page_key(request) if anonymous else None
 
-    popular_categories = (
-        approved_courses
-        .values("category")
-        .annotate(total=Count("id"))
-        .order_by("-total")
-    )
+    if page_key:
+        cached = cache.get(page_key)
+        if cached is not None:
+            patch_cache_control(cached, public=True, max_age=PUBLIC_MAX_AGE)
+            return cached
 
-    popular_courses = (
-        approved_courses
-        .annotate(popularity=Count("enrollments"))
-        .order_by("-popularity", "-created_at")[:4]
-    )
+    selected_category = request.GET.get("category")
 
-    courses = approved_courses.order_by("-created_at")
+    courses = approved_courses().order_by("-created_at")
 
     if selected_category:
         courses = courses.filter(category=selected_category)
 
+    page_obj = Paginator(courses, COURSES_PER_PAGE).get_page(request.GET.get("page"))
+
     context = {
-        "popular_categories": popular_categories,
-        "popular_courses": popular_courses,
-        "courses": courses,
+        **get_landing_aggregates(),
+        "courses": page_obj.object_list,
+        "page_obj": page_obj,
         "selected_category": selected_category,
     }
 
-    return render(request, "home/guest_home.html", context)
\ No newline at end of file
+    response = render(request, "home/guest_home.html", context)
+
+    # never replay per-visitor cookies from the shared cache
+    if page_key and response.status_code == 200 and not response.cookies:
+        cache.set(page_key, response, LANDING_TTL)
+        patch_cache_control(response, public=True, max_age=PUBLIC_MAX_AGE)
+
+    return response
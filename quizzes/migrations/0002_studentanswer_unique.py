@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:05
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def drop_duplicate_answers(apps, schema_editor):
+    StudentAnswer = apps.get_model('quizzes', 'StudentAnswer')
+    duplicates = (
+        StudentAnswer.objects.values('student_id', 'question_id')
+        .annotate(rows=Count('id'), keep=Max('id'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates.iterator():
+        StudentAnswer.objects.filter(
+            student_id=row['student_id'],
+            question_id=row['question_id'],
+            id__lt=row['keep']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_answers, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='studentanswer',
+            unique_together={('student', 'question')},
+        ),
+    ]
@@ -64,9 +64,38 @@ class StudentAnswer(models.Model):
     )
     submitted_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # one (latest) answer per question; lets grading upsert in bulk
+        unique_together = ("student", "question")
+
     def __str__(self):
         return f"{self.student.username} → {self.question.text}"
 
+class QuizAttempt(models.Model):
+    """
+    One sitting of a quiz. `seed` fixes the question and choice order,
+    `answers` maps question id -> chosen choice id once submitted.
+    """
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="attempts")
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        limit_choices_to={"role": "student"}
+    )
+    seed = models.PositiveIntegerField()
+    answers = models.JSONField(default=dict, blank=True)
+    score = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["quiz", "student"])]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.quiz.title} (seed {self.seed})"
+
+
 class QuizResult(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE)
     student = models.ForeignKey(
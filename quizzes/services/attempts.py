@@ -0,0 +1,129 @@
+import random
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from quizzes.models import QuizAttempt, QuizQuestion
+from quizzes.services.grading import grade_submission, quiz_version
+
+PAYLOAD_TTL = 60 * 60
+
+
+def quiz_content(quiz_id):
+    """
+    Questions with their choices (correct flags included) in stored order,
+    loaded once per quiz version.
+    """
+    key = f"quiz_content:{quiz_id}:{quiz_version(quiz_id)}"
+
+    content = cache.get(key)
+    if content is None:
+        content = [
+            {
+                "id": q.id,
+                "question_text": q.question_text,
+                "choices": [
+                    {"id": c.id, "text": c.text, "is_correct": c.is_correct}
+                    for c in q.choices.all()
+                ],
+            }
+            for q in QuizQuestion.objects.filter(quiz_id=quiz_id)
+            .prefetch_related("choices")
+            .order_by("id")
+        ]
+        cache.set(key, content, PAYLOAD_TTL)
+
+    return content
+
+
+def render_payload(quiz_id, seed):
+    """
+    The quiz as shown to a student: questions and choices shuffled by
+    `seed`, without correct flags. Same seed, same order.
+    """
+    key = f"quiz_payload:{quiz_id}:{quiz_version(quiz_id)}:{seed}"
+
+    payload = cache.get(key)
+    if payload is None:
+        rng = random.Random(seed)
+        payload = []
+        for question in quiz_content(quiz_id):
+            choices = [{"id": c["id"], "text": c["text"]} for c in question["choices"]]
+            rng.shuffle(choices)
+            payload.append({
+                "id": question["id"],
+                "question_text": question["question_text"],
+                "choices": choices,
+            })
+        rng.shuffle(payload)
+        cache.set(key, payload, PAYLOAD_TTL)
+
+    return payload
+
+
+def open_attempt(quiz, student):
+    """
+    The student's unsubmitted attempt, or a new one with a fresh seed.
+    Reloading the page keeps the same order.
+    """
+    attempt = (
+        QuizAttempt.objects.filter(quiz=quiz, student=student, submitted_at__isnull=True)
+        .order_by("-started_at")
+        .first()
+    )
+    if attempt is None:
+        attempt = QuizAttempt.objects.create(
+            quiz=quiz,
+            student=student,
+            seed=random.getrandbits(31)
+        )
+    return attempt
+
+
+def submit_attempt(attempt, data):
+    """
+    Grade the submitted form and record every answer on the attempt row.
+    Returns (score, total).
+    """
+    score, total, selected = grade_submission(attempt.quiz_id, attempt.student, data)
+
+    attempt.answers = {str(question_id): choice_id for question_id, choice_id in selected.items()}
+    attempt.score = score
+    attempt.total = total
+    attempt.submitted_at = timezone.now()
+    attempt.save(update_fields=["answers", "score", "total", "submitted_at"])
+
+    return score, total
+
+
+def last_submitted_attempt(quiz_id, student):
+    return (
+        QuizAttempt.objects.filter(quiz_id=quiz_id, student=student, submitted_at__isnull=False)
+        .order_by("-submitted_at")
+        .first()
+    )
+
+
+def review_answers(attempt):
+    """
+    [{"question", "choice", "correct_choice"}] for the answered questions of
+    an attempt, in the order the student saw them; built from the cached
+    quiz content, no per-answer queries.
+    """
+    questions = {q["id"]: q for q in quiz_content(attempt.quiz_id)}
+    review = []
+
+    for shown in render_payload(attempt.quiz_id, attempt.seed):
+        question = questions[shown["id"]]
+        choice_id = attempt.answers.get(str(question["id"]))
+        choice = next((c for c in question["choices"] if c["id"] == choice_id), None)
+        if choice is None:
+            continue
+
+        review.append({
+            "question": question,
+            "choice": choice,
+            "correct_choice": next((c for c in question["choices"] if c["is_correct"]), None),
+        })
+
+    return review
@@ -0,0 +1,111 @@
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from quizzes.models import QuizQuestion, StudentAnswer
+
+ANSWER_KEY_TTL = 60 * 60
+
+
+def _version_key(quiz_id):
+    return f"quiz_version:{quiz_id}"
+
+
+def quiz_version(quiz_id):
+    version = cache.get(_version_key(quiz_id))
+    if version is None:
+        cache.add(_version_key(quiz_id), time.time_ns(), None)
+        version = cache.get(_version_key(quiz_id))
+    return version
+
+
+def invalidate_quiz(quiz_id):
+    """
+    Called after questions or choices of the quiz were edited;
+    answer keys cached under the old version are never read again.
+    """
+    if quiz_id:
+        cache.set(_version_key(quiz_id), time.time_ns(), None)
+
+
+def get_answer_key(quiz_id):
+    """
+    {question_id: {"choices": {choice_id, ...}, "correct": {choice_id, ...}}}
+    for every question of the quiz, loaded with one query per quiz version.
+    """
+    key = f"quiz_answer_key:{quiz_id}:{quiz_version(quiz_id)}"
+
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = {}
+        # LEFT JOIN: questions without choices still count towards the total
+        rows = (
+            QuizQuestion.objects.filter(quiz_id=quiz_id)
+            .values_list("id", "choices__id", "choices__is_correct")
+        )
+        for question_id, choice_id, is_correct in rows:
+            entry = answer_key.setdefault(question_id, {"choices": set(), "correct": set()})
+            if choice_id is None:
+                continue
+            entry["choices"].add(choice_id)
+            if is_correct:
+                entry["correct"].add(choice_id)
+
+        cache.set(key, answer_key, ANSWER_KEY_TTL)
+
+    return answer_key
+
+
+def selected_choices(answer_key, data):
+    """
+    {question_id: choice_id} for the submitted answers that name a choice
+    of their own question; anything else is ignored.
+    """
+    selected = {}
+    for question_id, entry in answer_key.items():
+        value = data.get(f"q_{question_id}")
+        try:
+            choice_id = int(value)
+        except (TypeError, ValueError):
+            continue
+        if choice_id in entry["choices"]:
+            selected[question_id] = choice_id
+    return selected
+
+
+def save_answers(student, selected):
+    """
+    Upsert the student's latest answer per question in one statement.
+    """
+    now = timezone.now()
+    rows = [
+        StudentAnswer(student=student, question_id=question_id, choice_id=choice_id, submitted_at=now)
+        for question_id, choice_id in selected.items()
+    ]
+    if not rows:
+        return
+
+    options = {"update_conflicts": True, "update_fields": ["choice", "submitted_at"]}
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["student", "question"]
+
+    StudentAnswer.objects.bulk_create(rows, **options)
+
+
+def grade_submission(quiz_id, student, data):
+    """
+    Grade a submitted quiz against the cached answer key and store the answers.
+    Returns (score, total, selected).
+    """
+    answer_key = get_answer_key(quiz_id)
+    selected = selected_choices(answer_key, data)
+
+    score = sum(
+        1 for question_id, choice_id in selected.items()
+        if choice_id in answer_key[question_id]["correct"]
+    )
+
+    save_answers(student, selected)
+    return score, len(answer_key), selected
@@ -0,0 +1,229 @@
+import re
+import string
+
+from django.db import transaction
+
+from quizzes.models import QuizChoice, QuizQuestion
+from quizzes.services.grading import invalidate_quiz
+
+LETTERS = string.ascii_uppercase
+BATCH_SIZE = 500
+
+
+def _normalize_text(text):
+    return re.sub(r"\s+", " ", (text or "").strip()).lower()
+
+
+def normalize_question(item, auto_generated=None):
+    """
+    One incoming question as {"id", "question_text", "options", "correct_answer",
+    "is_auto_generated"}. Accepts the add-quiz page format, the RAG generator
+    output ({"question", "options": {"A": ...}, "correct_answer"}) and
+    options given as a plain list.
+    """
+    options = item.get("options") or {}
+    if isinstance(options, (list, tuple)):
+        options = dict(zip(LETTERS, options))
+    options = {str(k).strip().upper(): str(v) for k, v in options.items()}
+
+    correct = str(item.get("correct_answer") or "").strip().upper()[:1]
+
+    if auto_generated is None:
+        auto_generated = item.get("source") == "ai"
+
+    return {
+        "id": item.get("id"),
+        "question_text": (item.get("question") or item.get("question_text") or "").strip(),
+        "options": options,
+        "correct_answer": correct if correct in options else "",
+        "is_auto_generated": bool(auto_generated),
+    }
+
+
+def _choice_rows(options, correct):
+    """
+    Desired (text, is_correct) per letter, in letter order.
+    """
+    return [(options[key], key == correct) for key in sorted(options)]
+
+
+def sync_questions(quiz, questions, replace=False):
+    """
+    Bring the quiz's questions in line with `questions` in one transaction.
+
+    `questions` is a list of question dicts or a RAG /generate response.
+    Incoming questions match stored ones by id, else by question text;
+    matches are updated only where something changed, the rest is created.
+    With replace=True stored questions that were not matched are deleted.
+
+    Returns {"created", "updated", "unchanged", "deleted", "questions"}, where
+    "questions" lists the QuizQuestion rows in payload order.
+    """
+    auto_generated = None
+    if isinstance(questions, dict):
+        auto_generated = True if questions.get("mode") == "auto" else None
+        questions = questions.get("questions") or []
+
+    incoming = [
+        q for q in (normalize_question(item, auto_generated) for item in questions)
+        if q["question_text"]
+    ]
+
+    stats = {"created": 0, "updated": 0, "unchanged": 0, "deleted": 0, "questions": []}
+
+    with transaction.atomic():
+        existing = list(
+            QuizQuestion.objects.filter(quiz=quiz)
+            .prefetch_related("choices")
+            .order_by("id")
+        )
+        by_id = {q.id: q for q in existing}
+        by_text = {}
+        for q in existing:
+            by_text.setdefault(_normalize_text(q.question_text), q)
+
+        matched = set()
+        plan = []
+
+        for data in incoming:
+            question = by_id.get(_as_int(data["id"])) or by_text.get(_normalize_text(data["question_text"]))
+            if question is not None and question.id in matched:
+                question = None
+            if question is not None:
+                matched.add(question.id)
+            plan.append((data, question))
+
+        new_questions = [
+            QuizQuestion(
+                quiz=quiz,
+                question_text=data["question_text"],
+                options=data["options"],
+                correct_answer=data["correct_answer"],
+                is_auto_generated=data["is_auto_generated"],
+            )
+            for data, question in plan if question is None
+        ]
+        _bulk_create_with_pks(quiz, new_questions, exclude_ids=by_id.keys())
+
+        created = iter(new_questions)
+        questions_to_update = []
+        choices_to_create = []
+        choices_to_update = []
+        choices_to_delete = []
+
+        for data, question in plan:
+            if question is None:
+                question = next(created)
+                for text, is_correct in _choice_rows(data["options"], data["correct_answer"]):
+                    choices_to_create.append(QuizChoice(question=question, text=text, is_correct=is_correct))
+                stats["created"] += 1
+                stats["questions"].append(question)
+                continue
+
+            changed = False
+            for field in ("question_text", "options", "correct_answer"):
+                if getattr(question, field) != data[field]:
+                    setattr(question, field, data[field])
+                    changed = True
+            if changed:
+                questions_to_update.append(question)
+
+            current = sorted(question.choices.all(), key=lambda c: c.id)
+            desired = _choice_rows(data["options"], data["correct_answer"])
+
+            for choice, (text, is_correct) in zip(current, desired):
+                if choice.text != text or choice.is_correct != is_correct:
+                    choice.text = text
+                    choice.is_correct = is_correct
+                    choices_to_update.append(choice)
+                    changed = True
+            for text, is_correct in desired[len(current):]:
+                choices_to_create.append(QuizChoice(question=question, text=text, is_correct=is_correct))
+                changed = True
+            for choice in current[len(desired):]:
+                choices_to_delete.append(choice.id)
+                changed = True
+
+            stats["updated" if changed else "unchanged"] += 1
+            stats["questions"].append(question)
+
+        QuizQuestion.objects.bulk_update(
+            questions_to_update,
+            ["question_text", "options", "correct_answer"],
+            batch_size=BATCH_SIZE
+        )
+        QuizChoice.objects.bulk_create(choices_to_create, batch_size=BATCH_SIZE)
+        QuizChoice.objects.bulk_update(choices_to_update, ["text", "is_correct"], batch_size=BATCH_SIZE)
+        if choices_to_delete:
+            QuizChoice.objects.filter(id__in=choices_to_delete).delete()
+
+        if replace:
+            stale = [q.id for q in existing if q.id not in matched]
+            if stale:
+                QuizQuestion.objects.filter(id__in=stale).delete()
+            stats["deleted"] = len(stale)
+
+        if stats["created"] or stats["updated"] or stats["deleted"]:
+            transaction.on_commit(lambda: invalidate_quiz(quiz.id))
+
+    return stats
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _bulk_create_with_pks(quiz, new_questions, exclude_ids):
+    """
+    bulk_create the questions and make sure they carry their ids; MySQL does
+    not return them, so they are read back (one multi-row INSERT hands out
+    ascending ids in row order).
+    """
+    if not new_questions:
+        return
+
+    QuizQuestion.objects.bulk_create(new_questions, batch_size=BATCH_SIZE)
+    if all(q.pk for q in new_questions):
+        return
+
+    ids = list(
+        QuizQuestion.objects.filter(quiz=quiz)
+        .exclude(id__in=list(exclude_ids))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for question, pk in zip(new_questions, ids[-len(new_questions):]):
+        question.pk = pk
+        question.id = pk
+
+
+def preview_edits(questions, data):
+    """
+    Turn the quiz preview form (question_<id>, choice_<id>, correct_<id>)
+    into sync_questions input for the given questions (choices prefetched).
+    Blank fields keep the stored text; a question without a selected
+    correct choice ends up with none, as before.
+    """
+    edited = []
+    for question in questions:
+        choices = sorted(question.choices.all(), key=lambda c: c.id)
+        correct_id = str(data.get(f"correct_{question.id}") or "")
+
+        options = {}
+        correct = ""
+        for letter, choice in zip(LETTERS, choices):
+            options[letter] = data.get(f"choice_{choice.id}") or choice.text
+            if str(choice.id) == correct_id:
+                correct = letter
+
+        edited.append({
+            "id": question.id,
+            "question_text": data.get(f"question_{question.id}") or question.question_text,
+            "options": options,
+            "correct_answer": correct,
+            "source": "ai" if question.is_auto_generated else "manual",
+        })
+    return edited
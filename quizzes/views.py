@@ -1,8 +1,15 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from .models import Quiz, QuizChoice, QuizQuestion, StudentAnswer,  QuizResult
+from .models import Quiz, QuizChoice, QuizQuestion, QuizResult
 from courses.models import Course, LectureProgress, Module
-import random
+from quizzes.services.attempts import (
+    last_submitted_attempt,
+    open_attempt,
+    render_payload,
+    review_answers,
+    submit_attempt,
+)
+from quizzes.services.persistence import preview_edits, sync_questions
 from django.contrib import messages
 
 
@@ -34,40 +41,11 @@ def take_quiz(request, quiz_id):
         messages.error(request, "Maximum attempts reached.")
         return redirect("student:student_course_detail", course_id=quiz.course.id)
 
-    questions = list(quiz.questions.prefetch_related("choices"))
-
-    random.shuffle(questions)
-
-    for q in questions:
-        q.shuffled_choices = list(q.choices.all())
-        random.shuffle(q.shuffled_choices)
+    attempt = open_attempt(quiz, request.user)
 
     if request.method == "POST":
-        score = 0
-
-        for question in questions:
-            selected_choice_id = request.POST.get(f"q_{question.id}")
-            if not selected_choice_id:
-                continue
-
-            choice = QuizChoice.objects.filter(
-                id=selected_choice_id,
-                question=question
-            ).first()
-
-            if not choice:
-                continue
-
-            StudentAnswer.objects.update_or_create(
-                student=request.user,
-                question=question,
-                defaults={"choice": choice},
-            )
-
-            if choice.is_correct:
-                score += 1
-
-        total = len(questions)
+        # answer key from cache, choices checked in memory, one upsert
+        score, total = submit_attempt(attempt, request.POST)
         percent = (score / total) * 100 if total else 0
 
         result.attempts += 1
@@ -94,6 +72,9 @@ def take_quiz(request, quiz_id):
 
         return redirect("quiz_result", quiz_id=quiz.id)
 
+    # same seed, same order: reloading the page does not reshuffle
+    questions = render_payload(quiz.id, attempt.seed)
+
     return render(
         request,
         "quizzes/take_quiz.html",
@@ -128,14 +109,9 @@ def quiz_result(request, quiz_id):
             course_id=quiz.course.id
         )
 
-    answers = (
-        StudentAnswer.objects
-        .filter(student=request.user, question__quiz=quiz)
-        .select_related("question", "choice")
-        .prefetch_related("question__choices")
-    )
-
-    total_questions = quiz.questions.count()
+    attempt = last_submitted_attempt(quiz.id, request.user)
+    answers = review_answers(attempt) if attempt else []
+    total_questions = attempt.total if attempt else quiz.questions.count()
 
     percent = round(
         (result.score / total_questions) * 100,
@@ -144,13 +120,6 @@ def quiz_result(request, quiz_id):
 
     passed = percent >= PASS_PERCENT
 
-    if passed:
-        for a in answers:
-            a.correct_choice = next(
-                (c for c in a.question.choices.all() if c.is_correct),
-                None
-            )
-
     return render(
         request,
         "quizzes/quiz_result.html",
@@ -183,24 +152,8 @@ def preview_quiz(request, course_id, quiz_id):
     )
 
     if request.method == "POST":
-        for q in questions:
-            q_text = request.POST.get(f"question_{q.id}")
-            if q_text:
-                q.question_text = q_text
-                q.save()
-
-            correct_choice_id = request.POST.get(f"correct_{q.id}")
-
-            for choice in q.choices.all():
-                c_text = request.POST.get(f"choice_{choice.id}")
-                if c_text:
-                    choice.text = c_text
-
-                choice.is_correct = (
-                    str(choice.id) == str(correct_choice_id)
-                )
-
-                choice.save()
+        # only questions and choices that actually changed are written
+        sync_questions(quiz, preview_edits(questions, request.POST))
 
         return redirect(
             "instructor:quiz_preview",
@@ -13,7 +13,6 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
-from courses.utils import check_and_send_reminders
 from django.contrib.auth import update_session_auth_hash
 from django.db.models import Q, Avg, Count, Sum
 from django.contrib.admin.views.decorators import staff_member_required
@@ -25,6 +24,7 @@ from django.shortcuts import get_object_or_404, redirect
 from django.contrib.auth.hashers import make_password 
 from .models import PasswordChangeRequest
 from courses.services.recommendation_service import get_recommended_courses
+from courses.services.progress import get_progress_map
 
 from .models import User, Profile, LoginHistory, InstructorProfile
 from .forms import StudentSignUpForm, InstructorSignUpForm, ProfileForm, UserDisplayForm, InstructorUserReadOnlyForm, InstructorUserForm, InstructorProfileForm
@@ -122,15 +122,10 @@ def student_dashboard(request):
         student=user
     ).count()
 
-    total_lectures = Lecture.objects.filter(
-        module__course_id__in=enrolled_course_ids
-    ).count()
+    progress_map = get_progress_map((user.id, e.course_id) for e in enrollments)
 
-    completed_lectures = LectureProgress.objects.filter(
-        student=user,
-        completed=True,
-        lecture__module__course_id__in=enrolled_course_ids
-    ).count()
+    total_lectures = sum(p.total for p in progress_map.values())
+    completed_lectures = sum(p.completed for p in progress_map.values())
 
     if total_lectures > 0:
         average_progress = round((completed_lectures / total_lectures) * 100)
@@ -143,20 +138,7 @@ def student_dashboard(request):
     for enrollment in enrollments:
         course = enrollment.course
 
-        course_lectures = Lecture.objects.filter(
-            module__course=course
-        ).count()
-
-        completed = LectureProgress.objects.filter(
-            student=user,
-            completed=True,
-            lecture__module__course=course
-        ).count()
-
-        if course_lectures > 0:
-            progress = round((completed / course_lectures) * 100)
-        else:
-            progress = 0
+        progress = round(progress_map[(user.id, course.id)].percent)
 
         if progress == 100:
             completed_courses_count += 1
@@ -386,25 +368,17 @@ def student_my_activity(request):
         filtered_enrollments = enrollments.filter(course=selected_course)
 
     course_progress = []
+    progress_map = get_progress_map((user.id, e.course_id) for e in filtered_enrollments)
 
     for enroll in filtered_enrollments:
         course = enroll.course
-        lectures = Lecture.objects.filter(module__course=course)
-        total_lectures = lectures.count()
-
-        completed = LectureProgress.objects.filter(
-            student=user,
-            lecture__in=lectures,
-            completed=True
-        ).count()
-
-        percent = round((completed / total_lectures) * 100, 2) if total_lectures > 0 else 0
+        summary = progress_map[(user.id, course.id)]
 
         course_progress.append({
             "course": course,
-            "total_lectures": total_lectures,
-            "completed_lectures": completed,
-            "progress_percent": percent,
+            "total_lectures": summary.total,
+            "completed_lectures": summary.completed,
+            "progress_percent": summary.percent,
         })
 
     recent_videos = LectureProgress.objects.filter(
@@ -491,23 +465,8 @@ def student_my_activity(request):
         "lecture", "lecture__module", "lecture__module__course"
     ).prefetch_related("replies__user").order_by("-created_at")
 
-    total_completed = LectureProgress.objects.filter(
-        student=user,
-        completed=True
-    )
-
-    total_lectures = Lecture.objects.all()
-
-    if selected_course:
-        total_completed = total_completed.filter(
-            lecture__module__course=selected_course
-        )
-        total_lectures = total_lectures.filter(
-            module__course=selected_course
-        )
-
-    total_completed_count = total_completed.count()
-    total_lectures_count = total_lectures.count()
+    total_completed_count = sum(p["completed_lectures"] for p in course_progress)
+    total_lectures_count = sum(p["total_lectures"] for p in course_progress)
 
     overall_progress = (
         round((total_completed_count / total_lectures_count) * 100, 2)
@@ -649,8 +608,6 @@ def instructor_dashboard(request):
 
     instructor = request.user
 
-    check_and_send_reminders(instructor)
-
     courses = Course.objects.filter(instructor=instructor)
 
     unread_count = Notification.objects.filter(
@@ -1161,21 +1118,11 @@ def admin_view_student(request, user_id):
     total_progress = 0
     course_count = enrollments.count()
 
-    for enrollment in enrollments:
-        course = enrollment.course
-
-        total_lectures = Lecture.objects.filter(
-            module__course=course
-        ).count()
-
-        completed_lectures = LectureProgress.objects.filter(
-            student=student,
-            lecture__module__course=course,
-            completed=True
-        ).count()
+    progress_map = get_progress_map((student.id, e.course_id) for e in enrollments)
 
-        if total_lectures > 0:
-            progress_percent = (completed_lectures / total_lectures) * 100
+    for summary in progress_map.values():
+        if summary.total > 0:
+            progress_percent = summary.percent
             total_progress += progress_percent
 
             if progress_percent == 100: